@@ -4,12 +4,32 @@ import json as json_module
 import os
 import re
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from rich.console import Console
-from rich.json import JSON
-from rich.panel import Panel
-from rich.table import Table
+# Rich is imported only when rich mode is used, so plain mode (pipes, CI,
+# SUPEX_PLAIN=1) does not pay for loading it.
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+# Plain-mode JSON is pretty-printed with orjson, which indents in C. The
+# stdlib fallback is configured to produce the same text.
+try:
+    import orjson
+
+    def _dumps_indented(data: Any) -> str:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # Values orjson cannot encode (e.g. ints beyond 64 bits) still
+            # print the way they did before orjson was used here
+            return json_module.dumps(data, indent=2, ensure_ascii=False)
+except ImportError:  # pragma: no cover - depends on installed extras
+
+    def _dumps_indented(data: Any) -> str:
+        return json_module.dumps(data, indent=2, ensure_ascii=False)
 
 
 def _should_use_plain_output() -> bool:
@@ -22,32 +42,44 @@ def _should_use_plain_output() -> bool:
     4. FORCE_COLOR (any non-empty value) -> rich mode (standard)
     5. TTY detection -> rich if TTY, plain otherwise
     """
+    env = os.environ
+
     # Project-specific overrides (highest priority)
-    if os.environ.get("SUPEX_PLAIN") == "1":
+    if env.get("SUPEX_PLAIN") == "1":
         return True
-    if os.environ.get("SUPEX_COLOR") == "1":
+    if env.get("SUPEX_COLOR") == "1":
         return False
 
-    # Standard environment variables
-    no_color = os.environ.get("NO_COLOR", "")
-    if no_color:  # Any non-empty value
+    # Standard environment variables (any non-empty value)
+    if env.get("NO_COLOR"):
         return True
-
-    force_color = os.environ.get("FORCE_COLOR", "")
-    if force_color:  # Any non-empty value
+    if env.get("FORCE_COLOR"):
         return False
 
     # TTY detection fallback
     return not sys.stdout.isatty()
 
 
+# Rich markup tags such as [green] and [/green]
+_MARKUP_RE = re.compile(r"\[/?[a-zA-Z_]+\]")
+
+
 def _strip_markup(text: str) -> str:
     """Remove Rich markup tags from text.
 
     Handles tags like [green], [/green], [red], [dim], etc.
     Preserves unicode characters (checkmarks, etc.).
     """
-    return re.sub(r"\[/?[a-zA-Z_]+\]", "", text)
+    if "[" not in text:
+        # Most user content has no brackets at all: skip the regex
+        return text
+    return _MARKUP_RE.sub("", text)
+
+
+# Plain-mode message prefixes
+_OK_PREFIX = "[OK] "
+_ERROR_PREFIX = "[ERROR] "
+_WARN_PREFIX = "[WARN] "
 
 
 class Output:
@@ -56,11 +88,17 @@ class Output:
     def __init__(self) -> None:
         self._plain_mode = _should_use_plain_output()
         if not self._plain_mode:
+            from rich.console import Console
+
             # Use wide console to prevent truncation in non-terminal contexts
             self._console: Console | None = Console(width=200)
         else:
             self._console = None
 
+    def _emit(self, lines: list[str]) -> None:
+        """Write several plain-mode lines with a single print call."""
+        print("\n".join(lines))
+
     @property
     def is_plain(self) -> bool:
         """Return True if plain output mode is active."""
@@ -69,9 +107,9 @@ class Output:
     def print(self, *args: Any, **kwargs: Any) -> None:
         """Print text, stripping Rich markup in plain mode."""
         if self._plain_mode:
-            # Convert args to plain text
-            text = " ".join(_strip_markup(str(arg)) for arg in args)
-            print(text)
+            # Convert args to plain text. Tags cannot contain spaces, so
+            # stripping the joined text once matches stripping each arg.
+            print(_strip_markup(" ".join(map(str, args))))
         else:
             assert self._console is not None
             self._console.print(*args, **kwargs)
@@ -79,7 +117,7 @@ class Output:
     def success(self, message: str) -> None:
         """Print success message with checkmark."""
         if self._plain_mode:
-            print(f"[OK] {message}")
+            print(_OK_PREFIX + message)
         else:
             assert self._console is not None
             self._console.print(f"[green]\u2713[/green] {message}")
@@ -87,7 +125,7 @@ class Output:
     def error(self, message: str) -> None:
         """Print error message."""
         if self._plain_mode:
-            print(f"[ERROR] {message}", file=sys.stderr)
+            print(_ERROR_PREFIX + message, file=sys.stderr)
         else:
             assert self._console is not None
             self._console.print(f"[red]Error:[/red] {message}")
@@ -95,7 +133,7 @@ class Output:
     def warning(self, message: str) -> None:
         """Print warning message."""
         if self._plain_mode:
-            print(f"[WARN] {message}")
+            print(_WARN_PREFIX + message)
         else:
             assert self._console is not None
             self._console.print(f"[yellow]{message}[/yellow]")
@@ -118,24 +156,28 @@ class Output:
             plain_content = _strip_markup(content)
             if title:
                 separator = "-" * (len(title) + 8)
-                print(f"--- {title} ---")
-                print(plain_content)
-                print(separator)
+                self._emit([f"--- {title} ---", plain_content, separator])
             else:
                 print(plain_content)
         else:
+            from rich.panel import Panel
+
             assert self._console is not None
             self._console.print(Panel(content, title=title))
 
     def table(self, data: dict[str, Any], title: str | None = None) -> None:
         """Print key-value data as table or plain text."""
         if self._plain_mode:
-            if title:
-                print(f"{title}:")
+            lines = [f"{title}:"] if title else []
             max_key_len = max(len(str(k)) for k in data) if data else 0
-            for key, value in data.items():
-                print(f"  {key:<{max_key_len}}  {value}")
+            lines.extend(
+                f"  {key!s:<{max_key_len}}  {value}" for key, value in data.items()
+            )
+            if lines:
+                self._emit(lines)
         else:
+            from rich.table import Table
+
             assert self._console is not None
             table = Table(title=title)
             table.add_column("Property", style="cyan")
@@ -147,8 +189,10 @@ class Output:
     def json(self, data: Any) -> None:
         """Print JSON data with or without syntax highlighting."""
         if self._plain_mode:
-            print(json_module.dumps(data, indent=2))
+            print(_dumps_indented(data))
         else:
+            from rich.json import JSON
+
             assert self._console is not None
             self._console.print(JSON(json_module.dumps(data)))
 
@@ -1,10 +1,13 @@
 """SketchUp connection adapter via TCP sockets and JSON-RPC."""
 
 import contextlib
+import functools
 import json
 import logging
 import os
+import select
 import socket
+import sys
 import threading
 import time
 from dataclasses import dataclass, field
@@ -20,6 +23,34 @@ from supex_driver.connection.exceptions import (
 
 logger = logging.getLogger("supex.connection")
 
+# Requests and responses go through orjson, which writes and reads bytes
+# directly instead of going through str, and can append the frame newline
+# itself. Its JSONDecodeError subclasses the stdlib one, so error handling
+# is the same for both parsers.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _loads(data: bytes | bytearray | memoryview | str) -> Any:
+        return orjson.loads(data)
+except ImportError:  # pragma: no cover - depends on installed extras
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _dumps_line(obj: Any) -> bytes:
+        return _dumps(obj) + b"\n"
+
+    def _loads(data: bytes | bytearray | memoryview | str) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
 # Configuration with environment variable support
 DEFAULT_HOST = os.environ.get("SUPEX_HOST", "localhost")
 DEFAULT_PORT = int(os.environ.get("SUPEX_PORT", "9876"))
@@ -49,6 +80,16 @@ def _next_request_id() -> int:
         return _request_id_counter
 
 
+def _enable_quickack(sock: socket.socket) -> None:
+    """Ask the kernel to ACK received data immediately (Linux only).
+
+    Linux clears the flag again after some receives, so it is re-armed
+    after each response.
+    """
+    with contextlib.suppress(AttributeError, OSError):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+
 @dataclass
 class SketchupConnection:
     """Connection adapter for SketchUp socket server.
@@ -67,9 +108,19 @@ class SketchupConnection:
     timeout: float = DEFAULT_TIMEOUT
     agent: str = "unknown"
     token: str | None = AUTH_TOKEN
+    # Socket buffer sizes in bytes; None keeps the kernel's auto-tuned defaults
+    sndbuf: int | None = None
+    rcvbuf: int | None = None
     sock: socket.socket | None = field(default=None, repr=False)
     _identified: bool = field(default=False, repr=False)
+    # time.monotonic() of the last successful exchange; 0.0 means none yet
     _last_activity: float = field(default=0.0, repr=False)
+    # Received bytes not yet returned as a response
+    _rxbuf: bytearray = field(default_factory=bytearray, repr=False, compare=False)
+    # Serializes request/response exchanges on the shared socket
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
 
     def connect(self) -> bool:
         """Connect to the SketchUp runtime socket server and send hello handshake.
@@ -79,13 +130,23 @@ class SketchupConnection:
         """
         # Always create fresh connections
         self.disconnect()
+        self._rxbuf.clear()
 
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.settimeout(self.timeout)
             self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            _enable_quickack(self.sock)
+            # Set before connect() so the receive window is sized accordingly
+            for option, size in (
+                (socket.SO_SNDBUF, self.sndbuf),
+                (socket.SO_RCVBUF, self.rcvbuf),
+            ):
+                if size is not None:
+                    with contextlib.suppress(OSError):
+                        self.sock.setsockopt(socket.SOL_SOCKET, option, size)
             self.sock.connect((self.host, self.port))
-            logger.debug(f"Created connection to SketchUp at {self.host}:{self.port}")
+            logger.debug("Created connection to SketchUp at %s:%s", self.host, self.port)
 
             # Send hello handshake
             if not self._send_hello():
@@ -96,7 +157,7 @@ class SketchupConnection:
             self._identified = True
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to SketchUp: {e}")
+            logger.error("Failed to connect to SketchUp: %s", e)
             self.sock = None
             self._identified = False
             return False
@@ -129,21 +190,21 @@ class SketchupConnection:
         }
 
         try:
-            request_bytes = json.dumps(hello_request).encode("utf-8") + b"\n"
+            request_bytes = _dumps_line(hello_request)
             self.sock.sendall(request_bytes)
 
-            response_data = self.receive_full_response(self.sock)
-            response = json.loads(response_data.decode("utf-8"))
+            response_data = self.receive_full_response()
+            response = _loads(response_data)
 
             if "error" in response:
                 error_msg = response["error"].get("message", "Hello failed")
-                logger.error(f"Hello handshake failed: {error_msg}")
+                logger.error("Hello handshake failed: %s", error_msg)
                 return False
 
-            logger.debug(f"Hello handshake successful: {response.get('result', {})}")
+            logger.debug("Hello handshake successful: %s", response.get("result", {}))
             return True
         except Exception as e:
-            logger.error(f"Hello handshake error: {e}")
+            logger.error("Hello handshake error: %s", e)
             return False
 
     def disconnect(self) -> None:
@@ -152,21 +213,20 @@ class SketchupConnection:
             try:
                 self.sock.close()
             except Exception as e:
-                logger.error(f"Error disconnecting from SketchUp: {e}")
+                logger.error("Error disconnecting from SketchUp: %s", e)
             finally:
                 self.sock = None
                 self._identified = False
 
-    def receive_full_response(
-        self, sock: socket.socket, buffer_size: int = 4096
-    ) -> bytes:
+    def receive_full_response(self, buffer_size: int = 65536) -> bytes:
         """Receive a complete newline-delimited JSON response.
 
-        Reads from socket until a newline character is encountered,
-        enforcing maximum response size limits.
+        Reads from the connection's socket in large chunks into a buffer
+        kept on the connection until it holds a newline, enforcing maximum
+        response size limits. Bytes after the newline stay buffered for the
+        next response. The socket's own timeout applies; connect() sets it.
 
         Args:
-            sock: The socket to receive from.
             buffer_size: Size of receive buffer.
 
         Returns:
@@ -177,28 +237,36 @@ class SketchupConnection:
             SketchUpConnectionError: If connection is lost.
             SketchUpProtocolError: If response exceeds size limit or is incomplete.
         """
-        data = bytearray()
-        sock.settimeout(self.timeout)
+        # The buffer belongs to self.sock, so never read any other socket here
+        sock = self.sock
+        if sock is None:
+            raise SketchUpConnectionError("Not connected to SketchUp")
+        data = self._rxbuf
+        scanned = 0
 
         try:
             while True:
+                # Check if we have a complete message (newline-delimited)
+                newline = data.find(b"\n", scanned)
+                if newline != -1:
+                    response = bytes(data[: newline + 1])
+                    del data[: newline + 1]
+                    logger.debug("Received complete response (%d bytes)", len(response))
+                    return response
+                scanned = len(data)
+
+                if scanned > MAX_RESPONSE_BYTES:
+                    raise SketchUpProtocolError(
+                        f"Response exceeds maximum size ({MAX_RESPONSE_BYTES} bytes)"
+                    )
+
                 chunk = sock.recv(buffer_size)
                 if not chunk:
                     if not data:
                         raise SketchUpConnectionError("Connection closed by server")
                     raise SketchUpProtocolError("Incomplete response: connection closed")
 
-                data.extend(chunk)
-
-                if len(data) > MAX_RESPONSE_BYTES:
-                    raise SketchUpProtocolError(
-                        f"Response exceeds maximum size ({MAX_RESPONSE_BYTES} bytes)"
-                    )
-
-                # Check if we have a complete message (newline-delimited)
-                if b"\n" in chunk:
-                    logger.debug(f"Received complete response ({len(data)} bytes)")
-                    return bytes(data)
+                data += chunk
 
         except TimeoutError:
             if data:
@@ -217,28 +285,77 @@ class SketchupConnection:
             return False
 
         # Check idle timeout
-        if self._last_activity > 0:
-            idle_time = time.time() - self._last_activity
+        if self._last_activity:
+            idle_time = time.monotonic() - self._last_activity
             if idle_time > MAX_IDLE_TIME:
-                logger.debug(f"Connection idle for {idle_time:.1f}s, will reconnect")
+                logger.debug("Connection idle for %.1fs, will reconnect", idle_time)
                 return False
 
-        # Check if socket is still connected (non-blocking peek)
+        # Check if socket is still connected. A zero-timeout select leaves the
+        # socket's blocking mode alone; only a readable socket is peeked at.
         try:
-            self.sock.setblocking(False)
-            try:
-                data = self.sock.recv(1, socket.MSG_PEEK)
-                if not data:
-                    return False  # Connection closed by server
-            except BlockingIOError:
-                pass  # No data available = connection is alive
-            finally:
-                self.sock.setblocking(True)
-                self.sock.settimeout(self.timeout)
-            return True
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            if not readable:
+                return True  # No data available = connection is alive
+            # Readable with nothing to read = connection closed by server
+            return bool(self.sock.recv(1, socket.MSG_PEEK))
         except Exception:
             return False
 
+    @staticmethod
+    def _build_request(
+        method: str, params: dict[str, Any] | None, request_id: Any
+    ) -> dict[str, Any]:
+        """Build the JSON-RPC request object for a command."""
+        if (
+            method == "tools/call"
+            and params
+            and "name" in params
+            and "arguments" in params
+        ):
+            # Already in correct format
+            return {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params,
+                "id": request_id,
+            }
+        if method in ["resources/list"]:
+            # Direct JSON-RPC methods that shouldn't be wrapped as tools
+            return {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params or {},
+                "id": request_id,
+            }
+        # Convert direct command to JSON-RPC tools/call format
+        return {
+            "jsonrpc": "2.0",
+            "method": "tools/call",
+            "params": {"name": method, "arguments": params or {}},
+            "id": request_id,
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _request_prefix(method: str) -> bytes:
+        """Encode a parameterless request for a method up to its id value.
+
+        Commands without params differ only in their id, so the encoded
+        start is cached per method and the id is appended on each call.
+        """
+        request = SketchupConnection._build_request(method, None, None)
+        del request["id"]
+        return _dumps(request)[:-1] + b',"id":'
+
+    def _encode_request(
+        self, method: str, params: dict[str, Any] | None, request_id: Any
+    ) -> bytes:
+        """Encode the JSON-RPC request line for a command."""
+        if not params:
+            return b"".join((self._request_prefix(method), _dumps(request_id), b"}\n"))
+        return _dumps_line(self._build_request(method, params, request_id))
+
     def send_command(
         self, method: str, params: dict[str, Any] | None = None, request_id: Any = None
     ) -> dict[str, Any]:
@@ -255,76 +372,116 @@ class SketchupConnection:
         Raises:
             SketchUpConnectionError: If connection fails or is lost.
             SketchUpProtocolError: If response is invalid JSON.
+            SketchUpRemoteError: If SketchUp returns a JSON-RPC error.
             SketchUpTimeoutError: If socket operation times out.
         """
         # Generate request_id if not provided
         if request_id is None:
             request_id = _next_request_id()
 
+        payload = self._encode_request(method, params, request_id)
+        with self._lock:
+            response = self._exchange(payload, request_id, method)
+
+        if "error" in response:
+            error = response["error"]
+            raise SketchUpRemoteError(
+                code=error.get("code", -1),
+                message=error.get("message", "Unknown error from SketchUp"),
+                data=error.get("data"),
+            )
+
+        result: dict[str, Any] = response.get("result", {})
+        return result
+
+    def send_commands(
+        self, commands: list[tuple[str, dict[str, Any] | None]]
+    ) -> list[dict[str, Any]]:
+        """Send several commands to SketchUp as one JSON-RPC batch.
+
+        All requests go out in a single write and come back in a single
+        response array, so the batch costs one round trip. Errors are
+        reported per command instead of raising.
+
+        Args:
+            commands: (method, params) pairs, in execution order.
+
+        Returns:
+            One JSON-RPC response object per command, in command order
+            whatever order the runtime answered in. Each has either a
+            "result" or an "error" key.
+
+        Raises:
+            SketchUpConnectionError: If connection fails or is lost.
+            SketchUpProtocolError: If the response is not an array with a
+                response for every command.
+            SketchUpTimeoutError: If socket operation times out.
+        """
+        if not commands:
+            return []
+
+        requests = [
+            self._build_request(method, params, _next_request_id())
+            for method, params in commands
+        ]
+        batch_id = f"{requests[0]['id']}..{requests[-1]['id']}"
+        with self._lock:
+            responses = self._exchange(_dumps_line(requests), batch_id, f"batch of {len(requests)}")
+
+        if not isinstance(responses, list):
+            raise SketchUpProtocolError(
+                f"Invalid batch response from SketchUp: expected {len(requests)} results"
+            )
+        # JSON-RPC allows batch responses in any order: match them by id
+        by_id = {
+            response.get("id"): response
+            for response in responses
+            if isinstance(response, dict)
+        }
+        try:
+            return [by_id[request["id"]] for request in requests]
+        except KeyError as e:
+            raise SketchUpProtocolError(
+                f"Invalid batch response from SketchUp: no result for request {e}"
+            ) from None
+
+    def _exchange(self, payload: bytes, request_id: Any, method: str) -> Any:
+        """Send an encoded request (or batch) and return the parsed response.
+
+        Retries on connection errors, reconnecting between attempts.
+
+        Args:
+            payload: Encoded JSON-RPC request line, including the newline.
+            request_id: Request ID used in log messages.
+            method: Method name used in log messages.
+
+        Returns:
+            The parsed JSON-RPC response.
+        """
         # Reuse existing connection if healthy
         if not self._is_connection_healthy() and not self.connect():
             raise SketchUpConnectionError("Not connected to SketchUp")
         if self.sock is None:
             raise SketchUpConnectionError("Socket not initialized after connect")
 
-        # Convert to proper JSON-RPC format
-        if (
-            method == "tools/call"
-            and params
-            and "name" in params
-            and "arguments" in params
-        ):
-            # Already in correct format
-            request = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params,
-                "id": request_id,
-            }
-        elif method in ["resources/list"]:
-            # Direct JSON-RPC methods that shouldn't be wrapped as tools
-            request = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params or {},
-                "id": request_id,
-            }
-        else:
-            # Convert direct command to JSON-RPC tools/call format
-            request = {
-                "jsonrpc": "2.0",
-                "method": "tools/call",
-                "params": {"name": method, "arguments": params or {}},
-                "id": request_id,
-            }
-
         # Retry logic for connection issues
         retry_count = 0
 
         while retry_count <= MAX_RETRIES:
             try:
-                logger.debug(f"[req:{request_id}] Sending {method}")
-
-                request_bytes = json.dumps(request).encode("utf-8") + b"\n"
-                self.sock.sendall(request_bytes)
+                logger.debug("[req:%s] Sending %s", request_id, method)
 
-                response_data = self.receive_full_response(self.sock)
-                response = json.loads(response_data.decode("utf-8"))
+                self.sock.sendall(payload)
 
-                logger.debug(f"[req:{request_id}] Response received")
+                response_data = self.receive_full_response()
+                _enable_quickack(self.sock)
+                response = _loads(response_data)
 
-                if "error" in response:
-                    error = response["error"]
-                    raise SketchUpRemoteError(
-                        code=error.get("code", -1),
-                        message=error.get("message", "Unknown error from SketchUp"),
-                        data=error.get("data"),
-                    )
+                logger.debug("[req:%s] Response received", request_id)
 
                 # Update activity timestamp on success
-                self._last_activity = time.time()
-                result: dict[str, Any] = response.get("result", {})
-                return result
+                self._last_activity = time.monotonic()
+                return response
 
             except (
                 TimeoutError,
@@ -335,7 +492,11 @@ class SketchupConnection:
                 SketchUpConnectionError,
             ) as e:
                 logger.warning(
-                    f"[req:{request_id}] Connection error (attempt {retry_count + 1}/{MAX_RETRIES + 1}): {e}"
+                    "[req:%s] Connection error (attempt %d/%d): %s",
+                    request_id,
+                    retry_count + 1,
+                    MAX_RETRIES + 1,
+                    e,
                 )
                 retry_count += 1
 
@@ -353,15 +514,17 @@ class SketchupConnection:
                     )
 
             except json.JSONDecodeError as e:
-                logger.error(f"[req:{request_id}] Invalid JSON response: {e}")
+                logger.error("[req:%s] Invalid JSON response: %s", request_id, e)
                 if "response_data" in locals() and response_data:
                     logger.error(
-                        f"[req:{request_id}] Raw response (first 200 bytes): {response_data[:200]!r}"
+                        "[req:%s] Raw response (first 200 bytes): %r",
+                        request_id,
+                        response_data[:200],
                     )
                 raise SketchUpProtocolError(f"Invalid response from SketchUp: {e}")
 
             except Exception as e:
-                logger.error(f"[req:{request_id}] Error: {e}")
+                logger.error("[req:%s] Error: %s", request_id, e)
                 self.sock = None
                 raise
 
@@ -372,7 +535,8 @@ class SketchupConnection:
 # Global connection management with thread safety
 _connection_lock = threading.Lock()
 _sketchup_connection: SketchupConnection | None = None
-_connection_agent: str | None = None
+# (host, port, agent) the shared connection was created for
+_connection_key: tuple[str, int, str] | None = None
 
 
 def get_sketchup_connection(
@@ -380,7 +544,8 @@ def get_sketchup_connection(
 ) -> SketchupConnection:
     """Get or create a persistent SketchUp connection.
 
-    Thread-safe singleton pattern for connection management.
+    Thread-safe singleton pattern for connection management. The connection
+    is recreated when the host, port or agent differs from the current one.
 
     Args:
         host: Host to connect to.
@@ -390,12 +555,17 @@ def get_sketchup_connection(
     Returns:
         A SketchupConnection instance.
     """
-    global _sketchup_connection, _connection_agent
+    global _sketchup_connection, _connection_key
 
     with _connection_lock:
-        # If agent changed, recreate connection
-        if _sketchup_connection is not None and _connection_agent != agent:
-            logger.debug(f"Agent changed from {_connection_agent} to {agent}, recreating connection")
+        # If host, port or agent changed, recreate connection
+        key = (host, port, agent)
+        if _sketchup_connection is not None and _connection_key != key:
+            logger.debug(
+                "Connection target changed from %s to %s, recreating connection",
+                _connection_key,
+                key,
+            )
             with contextlib.suppress(Exception):
                 _sketchup_connection.disconnect()
             _sketchup_connection = None
@@ -406,16 +576,19 @@ def get_sketchup_connection(
                 if _sketchup_connection.sock:
                     return _sketchup_connection
             except Exception as e:
-                logger.warning(f"Existing connection is no longer valid: {e}")
+                logger.warning("Existing connection is no longer valid: %s", e)
                 with contextlib.suppress(Exception):
                     _sketchup_connection.disconnect()
                 _sketchup_connection = None
 
         if _sketchup_connection is None:
             _sketchup_connection = SketchupConnection(host=host, port=port, agent=agent)
-            _connection_agent = agent
+            _connection_key = (host, port, sys.intern(agent))
             # Note: Don't try to connect here - let individual commands handle connection attempts
             # This allows the server to remain available even when SketchUp isn't running
-            logger.debug(f"Created SketchUp connection (agent: {agent}, will be established on first use)")
+            logger.debug(
+                "Created SketchUp connection (agent: %s, will be established on first use)",
+                agent,
+            )
 
         return _sketchup_connection
@@ -1,11 +1,18 @@
 import atexit
 import contextlib
+import functools
+import inspect
 import json
 import logging
+import operator
 import os
 import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from typing import IO, Any, TextIO, cast
 
+import anyio
 from mcp.server import fastmcp
 from mcp.server.fastmcp import Context, FastMCP
 
@@ -14,6 +21,7 @@ McpContext = Context[Any, Any, Any]
 
 from supex_driver import __version__
 from supex_driver.connection import get_sketchup_connection
+from supex_driver.connection.connection import DEFAULT_HOST, DEFAULT_PORT
 from supex_driver.connection.exceptions import (
     SketchUpConnectionError,
     SketchUpProtocolError,
@@ -21,13 +29,45 @@ from supex_driver.connection.exceptions import (
     SketchUpTimeoutError,
 )
 
+# Tool responses are serialized with orjson (encodes in C, emits UTF-8
+# directly). It is a declared dependency; the stdlib encoder is only a
+# fallback for environments where the wheel is unavailable.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # pragma: no cover - depends on installed extras
+    def _dumps(obj: Any) -> str:
+        # Match orjson output: raw UTF-8 text and compact separators
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
 # Logger instance (configured when server starts)
 logger = logging.getLogger("supex.mcp")
 
-# MCP client identification (captured from clientInfo during initialization)
+# MCP client identification (captured from clientInfo during initialization).
+# The stdio transport serves exactly one MCP client per server process, so
+# once resolved the name is treated as fixed for the process lifetime.
 _mcp_client_name: str | None = None
 
 
+# Walks ctx.request_context.session.client_params.clientInfo.name in C
+_GET_CLIENT_NAME = operator.attrgetter(
+    "request_context.session.client_params.clientInfo.name"
+)
+
+
+def _resolve_client_name(ctx: McpContext) -> str | None:
+    """Read clientInfo.name from the MCP session behind a request context."""
+    try:
+        raw_name = _GET_CLIENT_NAME(ctx)
+    except AttributeError:
+        return None
+    if not raw_name or not isinstance(raw_name, str):
+        return None
+    return cast(str, raw_name)
+
+
 def get_agent_name(ctx: McpContext | None = None) -> str:
     """Get agent name from MCP client info or environment.
 
@@ -38,30 +78,22 @@ def get_agent_name(ctx: McpContext | None = None) -> str:
     """
     global _mcp_client_name
 
+    # Fast path: client name already resolved for this process
+    if _mcp_client_name is not None:
+        return _mcp_client_name
+
     # Try to get from Context
     if ctx is not None:
         try:
-            # Access: ctx.request_context.session.client_params.clientInfo.name
-            request_context = getattr(ctx, 'request_context', None)
-            if request_context:
-                session = getattr(request_context, 'session', None)
-                if session:
-                    client_params = getattr(session, 'client_params', None)
-                    if client_params:
-                        client_info = getattr(client_params, 'clientInfo', None)
-                        if client_info:
-                            raw_name = getattr(client_info, 'name', None)
-                            if raw_name and isinstance(raw_name, str):
-                                name: str = cast(str, raw_name)
-                                logger.info(f"Got client name from MCP clientInfo: {name}")
-                                _mcp_client_name = name
-                                return name
+            name = _resolve_client_name(ctx)
+            if name:
+                logger.info("Got client name from MCP clientInfo: %s", name)
+                # Interned so the key comparison in get_sketchup_connection
+                # hits the identity fast path
+                _mcp_client_name = name = sys.intern(name)
+                return name
         except Exception as e:
-            logger.debug(f"Error accessing MCP clientInfo: {e}")
-
-    # Use stored MCP client name if available
-    if _mcp_client_name:
-        return _mcp_client_name
+            logger.debug("Error accessing MCP clientInfo: %s", e)
 
     # Fallback to environment variable
     if agent := os.environ.get("SUPEX_AGENT"):
@@ -73,258 +105,467 @@ def get_agent_name(ctx: McpContext | None = None) -> str:
 # Flag to track if logging has been configured
 _logging_configured = False
 # Track open log files for cleanup
-_log_files: list[IO[str]] = []
+_log_files: list[IO[bytes]] = []
+
+# Buffered log output is written once this many bytes are pending...
+LOG_FLUSH_BYTES = 64 * 1024
+# ...or by the background flusher at this interval (seconds)
+LOG_FLUSH_INTERVAL = 0.1
 
 
 def _cleanup_log_files() -> None:
-    """Close all open log files on exit."""
+    """Flush and close all open log files on exit."""
     for f in _log_files:
-        with contextlib.suppress(Exception):
+        try:
+            f.flush()
             f.close()
+        except Exception:
+            pass
 
 
-atexit.register(_cleanup_log_files)
+# Attributes TeeStream copies from the wrapped stream at construction time
+_PREBOUND_STREAM_ATTRS = ("encoding", "errors", "buffer", "isatty", "fileno")
 
 
 class TeeStream:
-    """Stream that writes to both original stream and log file"""
+    """Stream that writes to both original stream and log file.
 
-    def __init__(self, original_stream: TextIO, log_file: TextIO) -> None:
+    Writes to the original stream stay synchronous. Log file writes are
+    buffered and written out when the buffer fills, on every flush() and
+    by a background thread shortly after output arrives. The thread sleeps
+    while nothing is pending, so an idle server does not wake up.
+    """
+
+    __slots__ = (
+        "original_stream",
+        "log_file",
+        "_buf",
+        "_lock",
+        "_pending",
+        "_stopped",
+        "_flusher",
+        # Pre-bound from the original stream (see _PREBOUND_STREAM_ATTRS)
+        "encoding",
+        "errors",
+        "buffer",
+        "isatty",
+        "fileno",
+    )
+
+    def __init__(self, original_stream: TextIO, log_file: IO[bytes]) -> None:
         self.original_stream = original_stream
         self.log_file = log_file
+        self._buf = bytearray()
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="supex-log-flush", daemon=True
+        )
+        self._flusher.start()
+        # Copy attributes the io machinery queries often, so lookups do not
+        # go through __getattr__. Missing ones stay unset and still forward.
+        for name in _PREBOUND_STREAM_ATTRS:
+            with contextlib.suppress(AttributeError):
+                setattr(self, name, getattr(original_stream, name))
 
     def write(self, data: str) -> int:
         self.original_stream.write(data)
-        self.log_file.write(data)
-        self.log_file.flush()
+        with self._lock:
+            if not self._buf:
+                self._pending.set()
+            self._buf += data.encode("utf-8", "replace")
+            if len(self._buf) >= LOG_FLUSH_BYTES:
+                self._write_log()
         return len(data)
 
+    def writelines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.write(line)
+
     def flush(self) -> None:
         self.original_stream.flush()
-        self.log_file.flush()
+        with self._lock:
+            self._write_log()
+
+    def close_log(self) -> None:
+        """Write any pending log output and stop the background flusher."""
+        self._stopped.set()
+        self._pending.set()
+        with self._lock:
+            self._write_log()
+
+    def _write_log(self) -> None:
+        """Write buffered data to the log file (caller must hold the lock)."""
+        if not self._buf:
+            return
+        try:
+            self.log_file.write(self._buf)
+            self.log_file.flush()
+        finally:
+            self._buf.clear()
+
+    def _flush_periodically(self) -> None:
+        while True:
+            self._pending.wait()
+            # Let further output accumulate for one interval, then write it
+            if self._stopped.wait(LOG_FLUSH_INTERVAL):
+                return
+            # Log file is best effort; keep mirroring to stderr
+            with self._lock, contextlib.suppress(OSError, ValueError):
+                self._pending.clear()
+                self._write_log()
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self.original_stream, name)
 
 
-def setup_logging() -> None:
-    """Configure logging for the MCP server.
+class LogFormatter(logging.Formatter):
+    """Formatter producing "asctime - name - levelname - message" lines.
 
-    Sets up file logging and configures the logging format.
-    Only runs once, even if called multiple times.
+    Equivalent to the "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    format string, but assembles the line with an f-string instead of
+    expanding the template against the record on every emit.
     """
-    global _logging_configured
-    if _logging_configured:
-        return
-    _logging_configured = True
 
-    # Setup file logging for stderr only (stdout is used by MCP protocol)
-    log_dir = os.environ.get("SUPEX_LOG_DIR", os.path.expanduser("~/.supex/logs"))
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record, self.datefmt)
+        line = f"{record.asctime} - {record.name} - {record.levelname} - {record.message}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
+
+
+def _install_stderr_tee() -> None:
+    """Mirror stderr into stderr.log in the log directory."""
+    log_dir = os.environ.get("SUPEX_LOG_DIR")
+    if log_dir is None:
+        log_dir = os.path.expanduser("~/.supex/logs")
     try:
         os.makedirs(log_dir, exist_ok=True)
         stderr_log_file = os.path.join(log_dir, "stderr.log")
 
-        # Redirect stderr to log file while preserving original
-        stderr_logger = open(stderr_log_file, 'a', encoding='utf-8')
+        # Redirect stderr to log file while preserving original. TeeStream
+        # batches log output itself, so the file is unbuffered: each batch
+        # is a single write(2) on the O_APPEND fd with no extra copy.
+        stderr_logger = open(stderr_log_file, 'ab', buffering=0)
+        if not _log_files:
+            atexit.register(_cleanup_log_files)
         _log_files.append(stderr_logger)
 
         # Only tee stderr, never stdout (MCP protocol uses stdout)
-        sys.stderr = TeeStream(sys.stderr, stderr_logger)
+        stderr_tee = TeeStream(sys.stderr, stderr_logger)
+        sys.stderr = stderr_tee
+        # Runs before _cleanup_log_files (atexit handlers are LIFO)
+        atexit.register(stderr_tee.close_log)
     except OSError:
         # If we can't create log directory, continue without file logging
         pass
 
+
+def setup_logging() -> None:
+    """Configure logging for the MCP server.
+
+    Sets up file logging and configures the logging format.
+    Only runs once, even if called multiple times.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
+    # Setup file logging for stderr only (stdout is used by MCP protocol).
+    # SUPEX_TEE=0 leaves stderr untouched and writes no stderr.log.
+    if os.environ.get("SUPEX_TEE", "1") != "0":
+        _install_stderr_tee()
+
     # Configure logging to stderr to avoid interfering with MCP stdio
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        stream=sys.stderr
-    )
+    root_logger = logging.getLogger()
+    if not root_logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(LogFormatter())
+        root_logger.addHandler(handler)
+        root_logger.setLevel(logging.INFO)
+
+    logger.info("Supex MCP Server version %s starting up", __version__)
+    logger.info("FastMCP version: %s", fastmcp.__version__)
+
+
+# Pre-encoded error responses, keyed by error_type. The {msg} and {code}
+# slots take already JSON-encoded values.
+_TOOL_ERRORS = {
+    "connection": '{{"success": false, "error": {msg}, "error_type": "connection"}}',
+    "protocol": '{{"success": false, "error": {msg}, "error_type": "protocol"}}',
+    "remote": (
+        '{{"success": false, "error": {msg}, "error_type": "remote", '
+        '"error_code": {code}}}'
+    ),
+    "unexpected": '{{"success": false, "error": {msg}, "error_type": "unexpected"}}',
+    "validation": '{{"success": false, "error": {msg}, "error_type": "validation"}}',
+}
+
+_STATUS_ERRORS = {
+    "connection": (
+        '{{"status": "disconnected", "error": {msg}, "error_type": "connection", '
+        '"message": "Make sure the SketchUp extension is running"}}'
+    ),
+    "protocol": (
+        '{{"status": "error", "error": {msg}, "error_type": "protocol", '
+        '"message": "Communication error with SketchUp"}}'
+    ),
+    "remote": (
+        '{{"status": "error", "error": {msg}, "error_type": "remote", '
+        '"error_code": {code}, "message": "SketchUp execution error"}}'
+    ),
+    "unexpected": (
+        '{{"status": "error", "error": {msg}, "error_type": "unexpected", '
+        '"message": "Unexpected error occurred"}}'
+    ),
+}
+
+
+def _format_error(
+    e: Exception, operation: str, templates: dict[str, str] = _TOOL_ERRORS
+) -> str:
+    """Log a tool error and render the matching JSON error response.
 
-    logger.info(f"Supex MCP Server version {__version__} starting up")
-    logger.info(f"FastMCP version: {fastmcp.__version__}")
+    Args:
+        e: Exception raised while executing the tool
+        operation: Description for error logging
+        templates: Error response templates keyed by error type
+
+    Returns:
+        JSON string with error information
+    """
+    if isinstance(e, (SketchUpConnectionError, SketchUpTimeoutError)):
+        logger.error("Connection error during %s: %s", operation, e)
+        return templates["connection"].format(msg=_dumps(str(e)))
+    if isinstance(e, SketchUpProtocolError):
+        logger.error("Protocol error during %s: %s", operation, e)
+        return templates["protocol"].format(msg=_dumps(str(e)))
+    if isinstance(e, SketchUpRemoteError):
+        logger.error("Remote error during %s: %s", operation, e)
+        return templates["remote"].format(msg=_dumps(e.message), code=_dumps(e.code))
+    logger.exception("Unexpected error during %s: %s", operation, e)
+    return templates["unexpected"].format(msg=_dumps(str(e)))
+
+
+def _validation_error(message: str) -> str:
+    """Render the error response for arguments rejected before any RPC."""
+    return _TOOL_ERRORS["validation"].format(msg=_dumps(message))
 
 
 # Create MCP server
 mcp = FastMCP("Supex")
 
 
-def call_tool(
+async def call_tool(
     ctx: McpContext,
     method: str,
+    operation: str,
     params: dict[str, Any] | None = None,
-    operation: str = "operation"
+    /,
+    *,
+    render: Callable[[dict[str, Any]], str] = _dumps,
+    error_templates: dict[str, str] = _TOOL_ERRORS,
 ) -> str:
     """Execute a tool call with standardized error handling.
 
     Args:
         ctx: MCP request context
         method: Tool method name to call
-        params: Optional parameters for the tool
         operation: Description for error logging
+        params: Parameters for the tool, kept apart from the call options
+            so a tool parameter can never be mistaken for one
+        render: Function turning the raw result into the JSON response
+        error_templates: Error response templates keyed by error type
 
     Returns:
         JSON string with result or error information
     """
+    request_id = ctx.request_id
     try:
-        sketchup = get_sketchup_connection(agent=get_agent_name(ctx))
-        result = sketchup.send_command(
-            method=method,
-            params=params or {},
-            request_id=ctx.request_id
+        agent = get_agent_name(ctx)
+        sketchup = get_sketchup_connection(agent=agent)
+        # The socket round trip blocks, so it runs in a worker thread and the
+        # event loop stays free to serve other requests meanwhile
+        result = await anyio.to_thread.run_sync(
+            functools.partial(
+                sketchup.send_command,
+                method=method,
+                params=params or {},
+                request_id=request_id,
+            )
         )
-        return json.dumps(result)
-    except (SketchUpConnectionError, SketchUpTimeoutError) as e:
-        logger.error(f"Connection error during {operation}: {e}")
-        return json.dumps({"success": False, "error": str(e), "error_type": "connection"})
-    except SketchUpProtocolError as e:
-        logger.error(f"Protocol error during {operation}: {e}")
-        return json.dumps({"success": False, "error": str(e), "error_type": "protocol"})
-    except SketchUpRemoteError as e:
-        logger.error(f"Remote error during {operation}: {e}")
-        return json.dumps({
-            "success": False,
-            "error": e.message,
-            "error_type": "remote",
-            "error_code": e.code
-        })
+        return render(result)
     except Exception as e:
-        logger.exception(f"Unexpected error during {operation}: {e}")
-        return json.dumps({"success": False, "error": str(e), "error_type": "unexpected"})
+        return _format_error(e, operation, error_templates)
+
+
+def _status_payload(version: Any) -> str:
+    """Encode the check_sketchup_status response for a runtime version."""
+    return _dumps(
+        {
+            "status": "connected",
+            "version": version,
+            "message": "SketchUp is connected and responding",
+        }
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _connected_status(version: str) -> str:
+    """Cached _status_payload, since health checks repeat with the same version."""
+    return _status_payload(version)
+
+
+def _render_status(result: dict[str, Any]) -> str:
+    """Render check_sketchup_status response from a ping result."""
+    version = result.get("version", "unknown")
+    if isinstance(version, str):
+        return _connected_status(version)
+    # Only hashable, stable versions are cached; anything else is encoded as is
+    return _status_payload(version)
+
+
+def _render_eval_result(result: dict[str, Any]) -> str:
+    """Render eval_ruby response, preferring the first content item text."""
+    content = result.get("content")
+    if isinstance(content, list) and content:
+        text = content[0].get("text", "Success")
+    else:
+        text = result.get("result", "Success")
+    return _dumps({"success": True, "result": text})
+
+
+def _passthrough_tool(
+    method: str, doc: str
+) -> Callable[[McpContext], Awaitable[str]]:
+    """Register a parameterless tool that forwards straight to a runtime method.
+
+    Args:
+        method: Runtime tool name, also used as the MCP tool name
+        doc: Tool description shown to MCP clients
+
+    Returns:
+        The registered tool function
+    """
+    async def tool(ctx: McpContext) -> str:
+        return await call_tool(ctx, method, method)
+
+    tool.__name__ = tool.__qualname__ = method
+    # doc is a plain string argument, so the compiler does not dedent it
+    # like a real docstring; clean it so clients get the same description
+    tool.__doc__ = inspect.cleandoc(doc)
+    return mcp.tool()(tool)
+
+
+# Agents tend to poll check_sketchup_status; a successful result is reused
+# for this long (seconds) instead of pinging SketchUp again. Entries are keyed
+# like the connection itself, so agents never see each other's status.
+STATUS_CACHE_TTL = 0.5
+_status_lock = threading.Lock()
+_status_cache: dict[tuple[str, int, str], tuple[float, str]] = {}
+
+
+def _render_and_remember_status(
+    key: tuple[str, int, str], result: dict[str, Any]
+) -> str:
+    """Render a successful status response and remember it for polling."""
+    response = _render_status(result)
+    with _status_lock:
+        _status_cache[key] = (time.monotonic(), response)
+    return response
 
 
 # Status and connection tools
 @mcp.tool()
-def check_sketchup_status(ctx: McpContext) -> str:
+async def check_sketchup_status(ctx: McpContext) -> str:
     """Check if SketchUp is connected and responding"""
-    try:
-        sketchup = get_sketchup_connection(agent=get_agent_name(ctx))
-        result = sketchup.send_command(
-            method="ping", params={}, request_id=ctx.request_id
-        )
-        return json.dumps(
-            {
-                "status": "connected",
-                "version": result.get("version", "unknown"),
-                "message": "SketchUp is connected and responding",
-            }
-        )
-    except (SketchUpConnectionError, SketchUpTimeoutError) as e:
-        return json.dumps(
-            {
-                "status": "disconnected",
-                "error": str(e),
-                "error_type": "connection",
-                "message": "Make sure the SketchUp extension is running",
-            }
-        )
-    except SketchUpProtocolError as e:
-        return json.dumps(
-            {
-                "status": "error",
-                "error": str(e),
-                "error_type": "protocol",
-                "message": "Communication error with SketchUp",
-            }
-        )
-    except SketchUpRemoteError as e:
-        return json.dumps(
-            {
-                "status": "error",
-                "error": e.message,
-                "error_type": "remote",
-                "error_code": e.code,
-                "message": "SketchUp execution error",
-            }
-        )
-    except Exception as e:
-        logger.exception(f"Unexpected error checking status: {e}")
-        return json.dumps(
-            {
-                "status": "error",
-                "error": str(e),
-                "error_type": "unexpected",
-                "message": "Unexpected error occurred",
-            }
-        )
+    key = (DEFAULT_HOST, DEFAULT_PORT, get_agent_name(ctx))
+    with _status_lock:
+        cached = _status_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+        return cached[1]
+    response = await call_tool(
+        ctx,
+        "ping",
+        "check_sketchup_status",
+        render=functools.partial(_render_and_remember_status, key),
+        error_templates=_STATUS_ERRORS,
+    )
+    with _status_lock:
+        entry = _status_cache.get(key)
+        # render only runs on success; otherwise the ping failed and the
+        # stale entry must not outlive it
+        if entry is not None and entry[1] is not response:
+            del _status_cache[key]
+    return response
+
+
+# Values accepted by the runtime, checked here to fail fast without a round trip
+_EXPORT_FORMATS = frozenset({"skp", "obj", "stl", "png", "jpg", "jpeg"})
+_ENTITY_TYPES = frozenset({"all", "faces", "edges", "groups", "components"})
 
 
 # Export functionality
 @mcp.tool()
-def export_scene(ctx: McpContext, format: str = "skp") -> str:
+async def export_scene(ctx: McpContext, format: str = "skp") -> str:
     """Export the current SketchUp scene
 
     Args:
-        format: Export format (skp, obj, dae, stl, png, jpg)
+        format: Export format (skp, obj, stl, png, jpg)
+
+    Returns:
+        JSON with file_path and format of the exported file (no file data).
+        Use Read tool on the file_path if the contents are needed.
     """
-    return call_tool(ctx, "export_scene", {"format": format}, "export_scene")
+    if format.lower() not in _EXPORT_FORMATS:
+        return _validation_error(f"Unsupported export format: {format}")
+    return await call_tool(ctx, "export_scene", "export_scene", {"format": format})
 
 
 # Ruby code evaluation
 @mcp.tool()
-def eval_ruby(ctx: McpContext, code: str) -> str:
+async def eval_ruby(ctx: McpContext, code: str) -> str:
     """Evaluate arbitrary Ruby code in SketchUp context
 
     Args:
         code: Ruby code to execute
     """
-    try:
-        logger.info(f"Evaluating Ruby code ({len(code)} characters)")
-
-        sketchup = get_sketchup_connection(agent=get_agent_name(ctx))
-
-        result = sketchup.send_command(
-            method="eval_ruby", params={"code": code}, request_id=ctx.request_id
-        )
-
-        # Format response consistently
-        response = {
-            "success": True,
-            "result": result.get("content", [{"text": "Success"}])[0].get(
-                "text", "Success"
-            )
-            if isinstance(result.get("content"), list)
-            and len(result.get("content", [])) > 0
-            else result.get("result", "Success"),
-        }
-
-        return json.dumps(response)
-    except (SketchUpConnectionError, SketchUpTimeoutError) as e:
-        logger.error(f"Connection error evaluating Ruby code: {e}")
-        return json.dumps({"success": False, "error": str(e), "error_type": "connection"})
-    except SketchUpProtocolError as e:
-        logger.error(f"Protocol error evaluating Ruby code: {e}")
-        return json.dumps({"success": False, "error": str(e), "error_type": "protocol"})
-    except SketchUpRemoteError as e:
-        logger.error(f"Remote error evaluating Ruby code: {e}")
-        return json.dumps({"success": False, "error": e.message, "error_type": "remote", "error_code": e.code})
-    except Exception as e:
-        logger.exception(f"Unexpected error evaluating Ruby code: {e}")
-        return json.dumps({"success": False, "error": str(e), "error_type": "unexpected"})
+    logger.info("Evaluating Ruby code (%d characters)", len(code))
+    return await call_tool(
+        ctx, "eval_ruby", "eval_ruby", {"code": code}, render=_render_eval_result
+    )
 
 
 # Console capture functionality
-@mcp.tool()
-def console_capture_status(ctx: McpContext) -> str:
-    """Get console capture status and log file information"""
-    return call_tool(ctx, "console_capture_status", {}, "console_capture_status")
+console_capture_status = _passthrough_tool(
+    "console_capture_status",
+    """Get console capture status and log file information""",
+)
 
 
 # File-based Ruby evaluation tools
 @mcp.tool()
-def eval_ruby_file(ctx: McpContext, file_path: str) -> str:
+async def eval_ruby_file(ctx: McpContext, file_path: str) -> str:
     """Evaluate Ruby code from a file in SketchUp context
 
     Args:
         file_path: Absolute path to Ruby file to execute
     """
-    logger.info(f"Evaluating Ruby file: {file_path}")
-    return call_tool(ctx, "eval_ruby_file", {"file_path": file_path}, "eval_ruby_file")
+    logger.info("Evaluating Ruby file: %s", file_path)
+    return await call_tool(ctx, "eval_ruby_file", "eval_ruby_file", {"file_path": file_path})
 
 
 # Introspection tools
-@mcp.tool()
-def get_model_info(ctx: McpContext) -> str:
+get_model_info = _passthrough_tool(
+    "get_model_info",
     """Get basic information about the current SketchUp model
 
     Returns model statistics including:
@@ -335,12 +576,12 @@ def get_model_info(ctx: McpContext) -> str:
     - num_groups: Number of groups
     - num_components: Number of component instances
     - modified: Whether model has unsaved changes
-    """
-    return call_tool(ctx, "get_model_info", {}, "get_model_info")
+    """,
+)
 
 
 @mcp.tool()
-def list_entities(ctx: McpContext, entity_type: str = "all") -> str:
+async def list_entities(ctx: McpContext, entity_type: str = "all") -> str:
     """List entities in the model
 
     Args:
@@ -348,49 +589,54 @@ def list_entities(ctx: McpContext, entity_type: str = "all") -> str:
 
     Returns list of entities with type, name, and layer information
     """
-    return call_tool(ctx, "list_entities", {"entity_type": entity_type}, "list_entities")
+    if entity_type not in _ENTITY_TYPES:
+        return _validation_error(
+            f"Unknown entity type: {entity_type}. "
+            "Use one of: faces, edges, groups, components, all"
+        )
+    return await call_tool(ctx, "list_entities", "list_entities", {"entity_type": entity_type})
 
 
-@mcp.tool()
-def get_selection(ctx: McpContext) -> str:
+get_selection = _passthrough_tool(
+    "get_selection",
     """Get currently selected entities in SketchUp
 
     Returns:
     - count: Number of selected entities
     - entities: List of selected entities with details (type, properties)
-    """
-    return call_tool(ctx, "get_selection", {}, "get_selection")
+    """,
+)
 
 
-@mcp.tool()
-def get_layers(ctx: McpContext) -> str:
+get_layers = _passthrough_tool(
+    "get_layers",
     """Get list of layers (tags) in the model
 
     Returns list of layers with name, visible state, and entity count
-    """
-    return call_tool(ctx, "get_layers", {}, "get_layers")
+    """,
+)
 
 
-@mcp.tool()
-def get_materials(ctx: McpContext) -> str:
+get_materials = _passthrough_tool(
+    "get_materials",
     """Get list of materials in the model
 
     Returns list of materials with name, color, and texture information
-    """
-    return call_tool(ctx, "get_materials", {}, "get_materials")
+    """,
+)
 
 
-@mcp.tool()
-def get_camera_info(ctx: McpContext) -> str:
+get_camera_info = _passthrough_tool(
+    "get_camera_info",
     """Get current camera position and settings
 
     Returns camera eye position, target, up vector, and field of view
-    """
-    return call_tool(ctx, "get_camera_info", {}, "get_camera_info")
+    """,
+)
 
 
 @mcp.tool()
-def take_screenshot(
+async def take_screenshot(
     ctx: McpContext,
     width: int = 1920,
     height: int = 1080,
@@ -413,18 +659,43 @@ def take_screenshot(
         JSON with file_path where screenshot was saved (~200 tokens vs 21k!)
         Use Read tool on the file_path to view screenshot if necessary
     """
-    params: dict[str, int | bool | str] = {
+    params: dict[str, Any] = {
         "width": width,
         "height": height,
         "transparent": transparent
     }
     if output_path:
         params["output_path"] = output_path
-    return call_tool(ctx, "take_screenshot", params, "take_screenshot")
+    return await call_tool(ctx, "take_screenshot", "take_screenshot", params)
+
+
+_NO_SHOTS_RESPONSE = _validation_error("No shots specified")
+
+
+def _compact_shots(
+    shots: list[dict[str, Any]], width: int, height: int
+) -> list[dict[str, Any]]:
+    """Drop per-shot width/height overrides that repeat the batch defaults.
+
+    The runtime falls back to the batch width/height for shots without
+    their own, so redundant overrides only add payload.
+    """
+    compacted = []
+    for shot in shots:
+        compact = shot
+        if shot.get("width") == width or shot.get("height") == height:
+            compact = {
+                key: value
+                for key, value in shot.items()
+                if not (key == "width" and value == width)
+                and not (key == "height" and value == height)
+            }
+        compacted.append(compact)
+    return compacted
 
 
 @mcp.tool()
-def take_batch_screenshots(
+async def take_batch_screenshots(
     ctx: McpContext,
     shots: list[dict[str, Any]],
     output_dir: str | None = None,
@@ -481,8 +752,10 @@ def take_batch_screenshots(
             base_name="model_view"
         )
     """
+    if not shots:
+        return _NO_SHOTS_RESPONSE
     params: dict[str, Any] = {
-        "shots": shots,
+        "shots": _compact_shots(shots, width, height),
         "base_name": base_name,
         "width": width,
         "height": height,
@@ -491,11 +764,11 @@ def take_batch_screenshots(
     }
     if output_dir:
         params["output_dir"] = output_dir
-    return call_tool(ctx, "take_batch_screenshots", params, "take_batch_screenshots")
+    return await call_tool(ctx, "take_batch_screenshots", "take_batch_screenshots", params)
 
 
 @mcp.tool()
-def open_model(ctx: McpContext, path: str) -> str:
+async def open_model(ctx: McpContext, path: str) -> str:
     """Open a SketchUp model file
 
     Args:
@@ -503,11 +776,11 @@ def open_model(ctx: McpContext, path: str) -> str:
 
     Returns success status and model information
     """
-    return call_tool(ctx, "open_model", {"path": path}, "open_model")
+    return await call_tool(ctx, "open_model", "open_model", {"path": path})
 
 
 @mcp.tool()
-def save_model(ctx: McpContext, path: str | None = None) -> str:
+async def save_model(ctx: McpContext, path: str | None = None) -> str:
     """Save the current SketchUp model
 
     Args:
@@ -515,8 +788,73 @@ def save_model(ctx: McpContext, path: str | None = None) -> str:
 
     Returns success status and saved file path
     """
-    params = {"path": path} if path else {}
-    return call_tool(ctx, "save_model", params, "save_model")
+    if path:
+        return await call_tool(ctx, "save_model", "save_model", {"path": path})
+    return await call_tool(ctx, "save_model", "save_model")
+
+
+def _batch_entry(method: str, response: dict[str, Any]) -> dict[str, Any]:
+    """Shape one JSON-RPC batch response for the batch_call result list."""
+    if "error" in response:
+        error = response["error"]
+        return {
+            "method": method,
+            "status": "error",
+            "error": error.get("message", "Unknown error from SketchUp"),
+            "error_code": error.get("code", -1),
+        }
+    return {"method": method, "status": "ok", "result": response.get("result", {})}
+
+
+@mcp.tool()
+async def batch_call(ctx: McpContext, calls: list[dict[str, Any]]) -> str:
+    """Run several SketchUp tools in one round trip
+
+    Use this instead of sequential calls when you need several independent
+    pieces of information, e.g. model info, selection and layers together.
+    Calls run in order; a failing call does not stop the rest.
+
+    Args:
+        calls: List of calls, each a dict with:
+            - method: Tool name (e.g. "get_model_info", "list_entities")
+            - params: Optional dict of tool parameters
+
+    Returns:
+        JSON with a results array, one entry per call in the same order.
+        Each entry has method, status ("ok" or "error") and either
+        result or error/error_code.
+
+    Example:
+        batch_call(calls=[
+            {"method": "get_model_info"},
+            {"method": "list_entities", "params": {"entity_type": "groups"}},
+            {"method": "get_selection"},
+        ])
+    """
+    commands = []
+    for index, call in enumerate(calls):
+        method = call.get("method")
+        params = call.get("params")
+        if not isinstance(method, str) or not (params is None or isinstance(params, dict)):
+            return _validation_error(
+                f"Call {index} needs a string method and optional dict params"
+            )
+        commands.append((method, params))
+    if not commands:
+        return _validation_error("No calls specified")
+
+    try:
+        sketchup = get_sketchup_connection(agent=get_agent_name(ctx))
+        responses = await anyio.to_thread.run_sync(sketchup.send_commands, commands)
+    except Exception as e:
+        return _format_error(e, "batch_call")
+    return _dumps({
+        "success": True,
+        "results": [
+            _batch_entry(method, response)
+            for (method, _), response in zip(commands, responses, strict=True)
+        ],
+    })
 
 
 def main() -> None:
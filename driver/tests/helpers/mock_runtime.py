@@ -1,12 +1,32 @@
 """Mock SketchUp runtime server for integration testing."""
 
 import contextlib
-import json
+import heapq
+import itertools
+import selectors
 import socket
 import threading
 import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any
 
+import orjson
+
+# Initial receive buffer size for a request (grows for larger requests)
+READ_BUFFER_SIZE = 65536
+
+# Longest the serve loop sleeps before rechecking whether it should stop
+SELECT_TIMEOUT = 0.1
+
+
+@dataclass
+class _ClientState:
+    """Receive buffer of one client connection."""
+
+    buf: bytearray = field(default_factory=lambda: bytearray(READ_BUFFER_SIZE))
+    offset: int = 0
+
 
 class MockRuntimeServer:
     """Mock TCP server simulating SketchUp runtime.
@@ -31,8 +51,17 @@ class MockRuntimeServer:
         self.requests: list[dict[str, Any]] = []
         self.delay: float = 0.0
         self.delay_method: str | None = None
+        # Result builders for methods without a configured response
+        self._handlers: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {}
+        self._set_default_handlers()
         self._running = False
         self._thread: threading.Thread | None = None
+        self._selector: selectors.BaseSelector | None = None
+        # Delayed replies as (due time, sequence, client, payload); the lock
+        # lets reset() drop them from the test thread
+        self._pending: list[tuple[float, int, socket.socket, bytes]] = []
+        self._pending_lock = threading.Lock()
+        self._sequence = itertools.count()
 
     def start(self) -> None:
         """Start the mock server."""
@@ -41,21 +70,21 @@ class MockRuntimeServer:
         self.server.bind(("127.0.0.1", self.port))
         self.port = self.server.getsockname()[1]
         self.server.listen(5)
-        self.server.settimeout(0.5)
+        self.server.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.server, selectors.EVENT_READ)
         self._running = True
-        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread = threading.Thread(target=self._serve_loop, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         """Stop the mock server."""
         self._running = False
-        if self.server:
-            with contextlib.suppress(Exception):
-                self.server.close()
-            self.server = None
         if self._thread:
+            # The serve loop closes the sockets and the selector on exit
             self._thread.join(timeout=1.0)
             self._thread = None
+        self.server = None
 
     def set_response(
         self,
@@ -72,6 +101,19 @@ class MockRuntimeServer:
         """
         self.responses[method] = {"result": result, "error": error}
 
+    def set_handler(
+        self, method: str, handler: Callable[[dict[str, Any]], dict[str, Any]]
+    ) -> None:
+        """Set a function computing the result for a method from the request.
+
+        Responses configured with set_response take precedence.
+
+        Args:
+            method: Method name (e.g., 'tools/call')
+            handler: Called with the request dict, returns the result
+        """
+        self._handlers[method] = handler
+
     def set_delay(self, delay: float, method: str | None = None) -> None:
         """Set response delay in seconds.
 
@@ -88,62 +130,145 @@ class MockRuntimeServer:
         self.delay = 0.0
         self.delay_method = None
 
-    def _accept_loop(self) -> None:
-        """Accept and handle connections."""
-        while self._running:
-            try:
-                client, _ = self.server.accept()
-                client.settimeout(5.0)
-                threading.Thread(
-                    target=self._handle_client, args=(client,), daemon=True
-                ).start()
-            except TimeoutError:
-                continue
-            except Exception:
-                if self._running:
-                    continue
-                break
-
-    def _handle_client(self, client: socket.socket) -> None:
-        """Handle a single client connection."""
+    def reset(self) -> None:
+        """Restore the freshly started state so the server can be reused.
+
+        Clears recorded requests, delay, configured responses, handlers and
+        delayed replies not yet sent. Open client connections are kept.
+        """
+        self.clear()
+        with self._pending_lock:
+            self._pending.clear()
+        self.responses = {}
+        self._set_default_handlers()
+
+    def _set_default_handlers(self) -> None:
+        """Install the built-in handlers, dropping any others."""
+        self._handlers = {
+            "hello": lambda request: {"success": True, "message": "Mock server"},
+            "ping": lambda request: {"status": "ok"},
+        }
+
+    def _serve_loop(self) -> None:
+        """Accept clients, read requests and send replies on one thread."""
         try:
             while self._running:
-                data = self._read_request(client)
-                if not data:
-                    break
+                timeout = SELECT_TIMEOUT
+                with self._pending_lock:
+                    if self._pending:
+                        due = self._pending[0][0]
+                        timeout = max(0.0, min(timeout, due - time.monotonic()))
+                for key, _ in self._selector.select(timeout):
+                    if key.fileobj is self.server:
+                        self._accept()
+                    else:
+                        self._read(key.fileobj, key.data)
+                self._send_due_replies()
+        finally:
+            for key in list(self._selector.get_map().values()):
+                with contextlib.suppress(Exception):
+                    key.fileobj.close()
+            self._selector.close()
+            self._pending.clear()
 
-                request = json.loads(data.decode("utf-8").strip())
-                self.requests.append(request)
+    def _accept(self) -> None:
+        """Accept a pending connection and watch it for requests."""
+        try:
+            client, _ = self.server.accept()
+        except OSError:
+            return
+        # Readiness comes from the selector; the timeout only bounds sendall
+        client.settimeout(5.0)
+        # Reply frames are tiny: send them without Nagle delay
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._selector.register(client, selectors.EVENT_READ, data=_ClientState())
 
-                # Apply delay before response (optionally only for specific method)
-                method = request.get("method", "")
-                if self.delay > 0 and (self.delay_method is None or method == self.delay_method):
-                    time.sleep(self.delay)
+    def _read(self, client: socket.socket, state: _ClientState) -> None:
+        """Receive from a readable client and handle every complete request."""
+        if state.offset == len(state.buf):
+            # Request larger than the buffer: double it
+            state.buf.extend(bytes(len(state.buf)))
+        try:
+            with memoryview(state.buf) as view:
+                received = client.recv_into(view[state.offset :])
+        except OSError:
+            received = 0
+        if not received:
+            self._close_client(client)
+            return
 
-                response = self._create_response(request)
-                client.sendall(json.dumps(response).encode("utf-8") + b"\n")
+        start = state.offset
+        state.offset += received
+        consumed = 0
+        newline = state.buf.find(b"\n", start, state.offset)
+        while newline != -1:
+            if not self._handle_request(client, bytes(state.buf[consumed:newline])):
+                return
+            consumed = newline + 1
+            newline = state.buf.find(b"\n", consumed, state.offset)
+        if consumed:
+            # Keep a partial trailing request at the start of the buffer
+            remaining = state.offset - consumed
+            state.buf[:remaining] = state.buf[consumed : state.offset]
+            state.offset = remaining
 
-        except Exception:
-            pass
-        finally:
-            with contextlib.suppress(Exception):
-                client.close()
-
-    def _read_request(self, client: socket.socket) -> bytes | None:
-        """Read a newline-delimited request."""
-        data = bytearray()
-        while True:
-            try:
-                chunk = client.recv(4096)
-                if not chunk:
-                    return None
-                data.extend(chunk)
-                if b"\n" in chunk:
-                    return bytes(data)
-            except TimeoutError:
-                return None
-            except Exception:
-                return None
+    def _handle_request(self, client: socket.socket, data: bytes) -> bool:
+        """Answer one request line. Returns False if the client was closed."""
+        try:
+            request = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            self._close_client(client)
+            return False
+
+        # A JSON array is a batch: answer every element in one array
+        batch = request if isinstance(request, list) else [request]
+        self.requests.extend(batch)
+
+        if isinstance(request, list):
+            response: Any = [self._create_response(item) for item in batch]
+        else:
+            response = self._create_response(request)
+        payload = orjson.dumps(response) + b"\n"
+
+        # Delay the reply (optionally only for a specific method) without
+        # holding up other clients
+        methods = {item.get("method", "") for item in batch}
+        if self.delay > 0 and (self.delay_method is None or self.delay_method in methods):
+            due = time.monotonic() + self.delay
+            with self._pending_lock:
+                heapq.heappush(
+                    self._pending, (due, next(self._sequence), client, payload)
+                )
+            return True
+        return self._send(client, payload)
+
+    def _send_due_replies(self) -> None:
+        """Send delayed replies whose time has come."""
+        now = time.monotonic()
+        ready: list[tuple[socket.socket, bytes]] = []
+        with self._pending_lock:
+            while self._pending and self._pending[0][0] <= now:
+                _, _, client, payload = heapq.heappop(self._pending)
+                ready.append((client, payload))
+        for client, payload in ready:
+            if client.fileno() != -1:
+                self._send(client, payload)
+
+    def _send(self, client: socket.socket, payload: bytes) -> bool:
+        """Send a reply. Returns False if the client was closed."""
+        try:
+            client.sendall(payload)
+        except OSError:
+            self._close_client(client)
+            return False
+        return True
+
+    def _close_client(self, client: socket.socket) -> None:
+        """Stop watching a client and close it."""
+        with contextlib.suppress(KeyError, ValueError):
+            self._selector.unregister(client)
+        with contextlib.suppress(Exception):
+            client.close()
 
     def _create_response(self, request: dict[str, Any]) -> dict[str, Any]:
         """Create response for a request."""
@@ -165,17 +290,12 @@ class MockRuntimeServer:
                 "id": request_id,
             }
 
-        # Default responses
-        if method == "hello":
-            return {
-                "jsonrpc": "2.0",
-                "result": {"success": True, "message": "Mock server"},
-                "id": request_id,
-            }
-        if method == "ping":
+        # Default and registered handlers
+        handler = self._handlers.get(method)
+        if handler is not None:
             return {
                 "jsonrpc": "2.0",
-                "result": {"status": "ok"},
+                "result": handler(request),
                 "id": request_id,
             }
 
@@ -3,13 +3,33 @@
 import json
 import socket
 import time
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 
-from supex_driver.connection import SketchupConnection
+from supex_driver.connection import SketchupConnection, get_sketchup_connection
 from supex_driver.connection import connection as connection_module
-from supex_driver.connection.exceptions import SketchUpConnectionError
+from supex_driver.connection.exceptions import (
+    SketchUpConnectionError,
+    SketchUpProtocolError,
+    SketchUpTimeoutError,
+)
+
+
+@pytest.fixture
+def hello_response() -> bytes:
+    """Provide a successful hello handshake reply line."""
+    return b'{"jsonrpc":"2.0","result":{"success":true},"id":"hello"}\n'
+
+
+@pytest.fixture
+def socket_pair():
+    """Provide a connected (client, server) pair of real sockets."""
+    client, server = socket.socketpair()
+    client.settimeout(1.0)
+    yield client, server
+    client.close()
+    server.close()
 
 
 class TestSketchupConnection:
@@ -42,6 +62,12 @@ class TestSketchupConnection:
         assert result is True
         mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_STREAM)
         mock_sock_instance.connect.assert_called_once_with(("localhost", 9876))
+        # Nagle is disabled before connecting
+        nodelay = call.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        assert nodelay in mock_sock_instance.mock_calls
+        assert mock_sock_instance.mock_calls.index(nodelay) < (
+            mock_sock_instance.mock_calls.index(call.connect(("localhost", 9876)))
+        )
         # Verify hello was sent
         mock_sock_instance.sendall.assert_called_once()
         sent_data = mock_sock_instance.sendall.call_args[0][0]
@@ -51,6 +77,78 @@ class TestSketchupConnection:
         assert conn.sock == mock_sock_instance
         assert conn._identified is True
 
+    @pytest.mark.skipif(
+        not hasattr(socket, "TCP_QUICKACK"), reason="TCP_QUICKACK is Linux-only"
+    )
+    @patch("socket.socket")
+    def test_quickack_enabled_on_connect_and_after_response(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that quick ACK is set on connect and re-armed after a response."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+        mock_sock_instance.recv.side_effect = [
+            hello_response,
+            b'{"jsonrpc":"2.0","result":{"ok":true},"id":1}\n',
+        ]
+
+        conn = SketchupConnection(host="localhost", port=9876, agent="test")
+        with patch.object(conn, "_is_connection_healthy", return_value=False):
+            conn.send_command("ping", request_id=1)
+
+        quickack = call.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        assert mock_sock_instance.mock_calls.count(quickack) == 2
+
+    @patch("socket.socket")
+    def test_quickack_failure_is_ignored(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that connect succeeds where quick ACK cannot be set."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+        mock_sock_instance.recv.return_value = hello_response
+
+        def setsockopt(level: int, option: int, value: int) -> None:
+            if option == getattr(socket, "TCP_QUICKACK", None):
+                raise OSError("Protocol not available")
+
+        mock_sock_instance.setsockopt.side_effect = setsockopt
+
+        conn = SketchupConnection(host="localhost", port=9876, agent="test")
+        assert conn.connect() is True
+
+    @pytest.mark.parametrize(
+        ("sndbuf", "rcvbuf"), [(None, None), (65536, None), (32768, 131072)]
+    )
+    @patch("socket.socket")
+    def test_socket_buffer_sizes(
+        self,
+        mock_socket: Mock,
+        sndbuf: int | None,
+        rcvbuf: int | None,
+        hello_response: bytes,
+    ) -> None:
+        """Test that buffer sizes are only set when configured."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+        mock_sock_instance.recv.return_value = hello_response
+
+        conn = SketchupConnection(
+            host="localhost", port=9876, sndbuf=sndbuf, rcvbuf=rcvbuf
+        )
+        assert conn.connect() is True
+
+        buffer_calls = [
+            c for c in mock_sock_instance.setsockopt.call_args_list
+            if c.args[0] == socket.SOL_SOCKET
+        ]
+        expected = []
+        if sndbuf is not None:
+            expected.append(call(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf))
+        if rcvbuf is not None:
+            expected.append(call(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf))
+        assert buffer_calls == expected
+
     @patch("socket.socket")
     def test_connect_failure(self, mock_socket: Mock) -> None:
         """Test connection failure handling."""
@@ -130,6 +228,54 @@ class TestJSONRPCFormat:
         assert "name" in parsed["params"]
         assert "arguments" in parsed["params"]
 
+    @patch("socket.socket")
+    def test_request_is_utf8_json_line(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that requests are sent as one UTF-8 JSON line, non-ASCII included."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+        recv_responses = [
+            hello_response,
+            '{"jsonrpc":"2.0","result":{"name":"Gr\u00f6\u00dfe"},"id":1}\n'.encode(),
+        ]
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        with patch.object(conn, "_is_connection_healthy", return_value=False):
+            result = conn.send_command("eval_ruby", {"code": "'Größe'"}, request_id=1)
+
+        sent = mock_sock_instance.sendall.call_args[0][0]
+        assert isinstance(sent, bytes)
+        assert sent.endswith(b"\n") and sent.count(b"\n") == 1
+        assert json.loads(sent.decode("utf-8"))["params"]["arguments"] == {"code": "'Größe'"}
+        assert result == {"name": "Größe"}
+
+    @pytest.mark.parametrize(
+        ("method", "request_id"),
+        [("ping", 1), ("get_selection", "abc-1"), ("resources/list", 7)],
+    )
+    def test_parameterless_request_matches_full_encoding(
+        self, method: str, request_id: object
+    ) -> None:
+        """Test that the cached request prefix encodes the same request."""
+        conn = SketchupConnection(host="localhost", port=9876)
+
+        payload = conn._encode_request(method, None, request_id)
+
+        assert payload.endswith(b"\n")
+        assert json.loads(payload) == conn._build_request(method, None, request_id)
+
+    def test_request_prefix_cached_per_method(self) -> None:
+        """Test that repeated parameterless commands reuse one cached prefix."""
+        SketchupConnection._request_prefix.cache_clear()
+        conn = SketchupConnection(host="localhost", port=9876)
+
+        payloads = [conn._encode_request("ping", None, i) for i in range(1000)]
+
+        assert SketchupConnection._request_prefix.cache_info().currsize == 1
+        assert [json.loads(p)["id"] for p in payloads] == list(range(1000))
+
 
 class TestTokenAuthentication:
     """Test token authentication in hello handshake."""
@@ -184,9 +330,24 @@ class TestTokenAuthentication:
 
     def test_token_field_defaults_to_env(self) -> None:
         """Test that token field uses AUTH_TOKEN constant by default."""
-        from supex_driver.connection.connection import AUTH_TOKEN
         conn = SketchupConnection(host="localhost", port=9876)
-        assert conn.token == AUTH_TOKEN
+        assert conn.token == connection_module.AUTH_TOKEN
+
+    def test_token_env_read_once_at_import(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that changing SUPEX_AUTH_TOKEN after import does not affect new connections."""
+        monkeypatch.setenv("SUPEX_AUTH_TOKEN", "changed-after-import")
+
+        conn = SketchupConnection(host="localhost", port=9876)
+
+        assert conn.token == connection_module.AUTH_TOKEN
+        assert conn.token != "changed-after-import"
+
+    def test_empty_token_is_kept(self) -> None:
+        """Test that an explicit empty token is not replaced by the default."""
+        conn = SketchupConnection(host="localhost", port=9876, token="")
+        assert conn.token == ""
 
 
 class TestConnectionReuse:
@@ -205,18 +366,13 @@ class TestConnectionReuse:
         assert conn._is_connection_healthy() is False
 
     @patch("socket.socket")
-    def test_connection_reuse_multiple_commands(self, mock_socket: Mock) -> None:
+    def test_connection_reuse_multiple_commands(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
         """Test that multiple commands reuse the same connection."""
         mock_sock_instance = Mock()
         mock_socket.return_value = mock_sock_instance
 
-        # Mock hello response
-        hello_response = json.dumps({
-            "jsonrpc": "2.0",
-            "result": {"success": True},
-            "id": "hello"
-        }).encode("utf-8") + b"\n"
-
         # Mock command response
         command_response = json.dumps({
             "jsonrpc": "2.0",
@@ -224,28 +380,25 @@ class TestConnectionReuse:
             "id": 1
         }).encode("utf-8") + b"\n"
 
-        def recv_side_effect(*args, **kwargs):
-            # MSG_PEEK is used for health check - simulate no data available
-            if args and args[0] == 1:
-                raise BlockingIOError()
-            return recv_responses.pop(0)
-
         recv_responses = [
             hello_response,   # First connect hello
             command_response,  # First command
             command_response,  # Second command
             command_response,  # Third command
         ]
-        mock_sock_instance.recv.side_effect = recv_side_effect
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
 
         conn = SketchupConnection(host="localhost", port=9876)
 
-        # Send 3 commands
-        for _ in range(3):
-            conn.send_command("ping")
+        # Send 3 commands; the health check finds no pending data
+        with patch.object(connection_module.select, "select", return_value=([], [], [])):
+            for _ in range(3):
+                conn.send_command("ping")
 
         # connect() should only be called once
         assert mock_sock_instance.connect.call_count == 1
+        # The timeout is set once at connect, not per response
+        mock_sock_instance.settimeout.assert_called_once_with(conn.timeout)
 
     def test_health_check_detects_idle_timeout(self) -> None:
         """Test health check returns False when connection has been idle too long."""
@@ -254,7 +407,7 @@ class TestConnectionReuse:
         conn._identified = True
 
         # Set last activity to long ago
-        conn._last_activity = time.time() - 1000
+        conn._last_activity = time.monotonic() - 1000
 
         # Temporarily set short idle timeout
         original_max_idle = connection_module.MAX_IDLE_TIME
@@ -264,63 +417,84 @@ class TestConnectionReuse:
         finally:
             connection_module.MAX_IDLE_TIME = original_max_idle
 
-    def test_health_check_detects_closed_socket(self) -> None:
+    def test_health_check_detects_closed_socket(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
         """Test health check returns False when socket is closed by server."""
+        client, server = socket_pair
         conn = SketchupConnection(host="localhost", port=9876)
-        mock_sock = Mock()
-        conn.sock = mock_sock
+        conn.sock = client
         conn._identified = True
-        conn._last_activity = time.time()
+        conn._last_activity = time.monotonic()
 
-        # Mock recv returning empty bytes (connection closed)
-        mock_sock.recv.return_value = b""
+        server.close()
 
         assert conn._is_connection_healthy() is False
 
-    def test_health_check_passes_when_no_data_available(self) -> None:
+    def test_health_check_passes_when_no_data_available(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
         """Test health check returns True when socket is alive but no data."""
+        client, _ = socket_pair
         conn = SketchupConnection(host="localhost", port=9876)
-        mock_sock = Mock()
-        conn.sock = mock_sock
+        conn.sock = client
         conn._identified = True
-        conn._last_activity = time.time()
+        conn._last_activity = time.monotonic()
 
-        # Mock recv raising BlockingIOError (no data available)
-        mock_sock.recv.side_effect = BlockingIOError()
+        assert conn._is_connection_healthy() is True
+        # The probe leaves the socket's blocking mode and timeout alone
+        assert client.gettimeout() == 1.0
+
+    def test_health_check_does_not_consume_pending_data(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        """Test health check peeks at pending data without reading it."""
+        client, server = socket_pair
+        conn = SketchupConnection(host="localhost", port=9876)
+        conn.sock = client
+        conn._identified = True
+        conn._last_activity = time.monotonic()
+
+        server.sendall(b"{}\n")
 
         assert conn._is_connection_healthy() is True
+        assert conn.receive_full_response() == b"{}\n"
+
+    def test_health_check_fails_on_select_error(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        """Test health check returns False when the socket cannot be polled."""
+        client, _ = socket_pair
+        conn = SketchupConnection(host="localhost", port=9876)
+        conn.sock = client
+        conn._identified = True
+        conn._last_activity = time.monotonic()
+
+        client.close()
+
+        assert conn._is_connection_healthy() is False
 
     @patch("socket.socket")
-    def test_reconnect_after_idle_timeout(self, mock_socket: Mock) -> None:
+    def test_reconnect_after_idle_timeout(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
         """Test that connection reconnects after idle timeout."""
         mock_sock_instance = Mock()
         mock_socket.return_value = mock_sock_instance
 
-        # Mock responses
-        hello_response = json.dumps({
-            "jsonrpc": "2.0",
-            "result": {"success": True},
-            "id": "hello"
-        }).encode("utf-8") + b"\n"
         command_response = json.dumps({
             "jsonrpc": "2.0",
             "result": {"status": "ok"},
             "id": 1
         }).encode("utf-8") + b"\n"
 
-        def recv_side_effect(*args, **kwargs):
-            # MSG_PEEK is used for health check - simulate no data available
-            if args and args[0] == 1:
-                raise BlockingIOError()
-            return recv_responses.pop(0)
-
         recv_responses = [
             hello_response,   # First connect
             command_response,  # First command
             hello_response,   # Second connect (after idle)
             command_response,  # Second command
         ]
-        mock_sock_instance.recv.side_effect = recv_side_effect
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
 
         conn = SketchupConnection(host="localhost", port=9876)
 
@@ -333,7 +507,7 @@ class TestConnectionReuse:
         original_max_idle = connection_module.MAX_IDLE_TIME
         try:
             connection_module.MAX_IDLE_TIME = 0.1
-            conn._last_activity = time.time() - 1.0  # 1 second ago
+            conn._last_activity = time.monotonic() - 1.0  # 1 second ago
 
             # Send second command - should trigger reconnect
             conn.send_command("ping")
@@ -342,16 +516,13 @@ class TestConnectionReuse:
             connection_module.MAX_IDLE_TIME = original_max_idle
 
     @patch("socket.socket")
-    def test_last_activity_updated_on_success(self, mock_socket: Mock) -> None:
+    def test_last_activity_updated_on_success(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
         """Test that _last_activity is updated after successful command."""
         mock_sock_instance = Mock()
         mock_socket.return_value = mock_sock_instance
 
-        hello_response = json.dumps({
-            "jsonrpc": "2.0",
-            "result": {"success": True},
-            "id": "hello"
-        }).encode("utf-8") + b"\n"
         command_response = json.dumps({
             "jsonrpc": "2.0",
             "result": {"status": "ok"},
@@ -364,9 +535,9 @@ class TestConnectionReuse:
         conn = SketchupConnection(host="localhost", port=9876)
         assert conn._last_activity == 0.0
 
-        before = time.time()
+        before = time.monotonic()
         conn.send_command("ping")
-        after = time.time()
+        after = time.monotonic()
 
         assert conn._last_activity >= before
         assert conn._last_activity <= after
@@ -394,3 +565,227 @@ class TestConnectionErrorHandling:
                 conn.send_command("ping")
 
             assert "Socket not initialized" in str(exc_info.value)
+
+    @pytest.mark.parametrize("payload", [b"{not json}\n", b'{"result": "\xff"}\n'])
+    @patch("socket.socket")
+    def test_malformed_response_raises_protocol_error(
+        self, mock_socket: Mock, payload: bytes, hello_response: bytes
+    ) -> None:
+        """Test that invalid JSON or invalid UTF-8 is reported as a protocol error."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+
+        recv_responses = [hello_response, payload]
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        with pytest.raises(SketchUpProtocolError):
+            conn.send_command("ping")
+
+
+class TestReceiveFullResponse:
+    """Test newline-delimited response framing."""
+
+    def test_response_split_across_recvs(self) -> None:
+        """Test that a response arriving in pieces is joined into one line."""
+        sock = Mock()
+        sock.recv.side_effect = [b'{"jsonrpc":"2.0",', b'"result":{},', b'"id":1}\n']
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        conn.sock = sock
+        response = conn.receive_full_response()
+
+        assert response == b'{"jsonrpc":"2.0","result":{},"id":1}\n'
+        assert sock.recv.call_count == 3
+        sock.recv.assert_called_with(65536)
+
+    def test_two_responses_in_one_recv(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        """Test that a second response arriving with the first is kept for later."""
+        client, server = socket_pair
+        server.sendall(
+            b'{"jsonrpc":"2.0","result":{"n":1},"id":1}\n'
+            b'{"jsonrpc":"2.0","result":{"n":2},"id":2}\n'
+        )
+        server.close()
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        conn.sock = client
+        first = conn.receive_full_response()
+        # Served from the buffer: another recv would hit the closed peer
+        second = conn.receive_full_response()
+
+        assert json.loads(first)["result"] == {"n": 1}
+        assert json.loads(second)["result"] == {"n": 2}
+
+    def test_connection_closed_mid_response(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        """Test that EOF after partial data is a protocol error."""
+        client, server = socket_pair
+        server.sendall(b'{"jsonrpc":"2.0",')
+        server.close()
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        conn.sock = client
+        with pytest.raises(SketchUpProtocolError, match="connection closed"):
+            conn.receive_full_response()
+
+    def test_timeout_without_data(
+        self, socket_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        """Test that a silent peer raises a timeout error."""
+        client, _ = socket_pair
+        client.settimeout(0.05)
+
+        conn = SketchupConnection(host="localhost", port=9876, timeout=0.05)
+        conn.sock = client
+        with pytest.raises(SketchUpTimeoutError):
+            conn.receive_full_response()
+
+    def test_not_connected(self) -> None:
+        """Test that reading without a socket is a connection error."""
+        conn = SketchupConnection(host="localhost", port=9876)
+        with pytest.raises(SketchUpConnectionError, match="Not connected"):
+            conn.receive_full_response()
+
+
+class TestSendCommands:
+    """Test JSON-RPC batch requests."""
+
+    @patch("socket.socket")
+    def test_send_commands_uses_one_request(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that a batch is sent as one JSON array and returned in order."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+
+        batch_response = json.dumps([
+            {"jsonrpc": "2.0", "result": {"entities": 3}, "id": 1},
+            {"jsonrpc": "2.0", "error": {"code": -32603, "message": "boom"}, "id": 2},
+        ]).encode("utf-8") + b"\n"
+        recv_responses = [hello_response, batch_response]
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        with patch.object(connection_module, "_next_request_id", side_effect=[1, 2]):
+            responses = conn.send_commands(
+                [("get_model_info", None), ("eval_ruby", {"code": "x"})]
+            )
+
+        # hello + one batch
+        assert mock_sock_instance.sendall.call_count == 2
+        sent = json.loads(mock_sock_instance.sendall.call_args[0][0])
+        assert [r["params"]["name"] for r in sent] == ["get_model_info", "eval_ruby"]
+        assert sent[1]["params"]["arguments"] == {"code": "x"}
+        assert responses[0]["result"] == {"entities": 3}
+        assert responses[1]["error"]["message"] == "boom"
+
+    def test_send_commands_empty_batch_skips_network(self) -> None:
+        """Test that an empty batch returns immediately."""
+        conn = SketchupConnection(host="localhost", port=9876)
+        with patch.object(conn, "connect") as mock_connect:
+            assert conn.send_commands([]) == []
+        mock_connect.assert_not_called()
+
+    @patch("socket.socket")
+    def test_send_commands_rejects_non_array_response(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that a single-object reply to a batch is a protocol error."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+
+        error_response = json.dumps({
+            "jsonrpc": "2.0",
+            "error": {"code": -32600, "message": "Invalid Request"},
+            "id": None,
+        }).encode("utf-8") + b"\n"
+        recv_responses = [hello_response, error_response]
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        with pytest.raises(SketchUpProtocolError):
+            conn.send_commands([("ping", None)])
+
+    @patch("socket.socket")
+    def test_send_commands_matches_responses_by_id(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that out-of-order batch responses are returned in command order."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+
+        batch_response = json.dumps([
+            {"jsonrpc": "2.0", "result": {"name": "second"}, "id": 8},
+            {"jsonrpc": "2.0", "result": {"name": "first"}, "id": 7},
+        ]).encode("utf-8") + b"\n"
+        recv_responses = [hello_response, batch_response]
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        with patch.object(connection_module, "_next_request_id", side_effect=[7, 8]):
+            responses = conn.send_commands([("first", None), ("second", None)])
+
+        assert [r["result"]["name"] for r in responses] == ["first", "second"]
+
+    @patch("socket.socket")
+    def test_send_commands_rejects_missing_response(
+        self, mock_socket: Mock, hello_response: bytes
+    ) -> None:
+        """Test that a batch response without a result for every id is an error."""
+        mock_sock_instance = Mock()
+        mock_socket.return_value = mock_sock_instance
+
+        batch_response = json.dumps([
+            {"jsonrpc": "2.0", "result": {"name": "first"}, "id": 7},
+        ]).encode("utf-8") + b"\n"
+        recv_responses = [hello_response, batch_response]
+        mock_sock_instance.recv.side_effect = lambda *args, **kwargs: recv_responses.pop(0)
+
+        conn = SketchupConnection(host="localhost", port=9876)
+        with (
+            patch.object(connection_module, "_next_request_id", side_effect=[7, 8]),
+            pytest.raises(SketchUpProtocolError, match="no result for request 8"),
+        ):
+            conn.send_commands([("first", None), ("second", None)])
+
+
+class TestGetSketchupConnection:
+    """Test the shared connection returned by get_sketchup_connection."""
+
+    @pytest.fixture(autouse=True)
+    def reset_shared_connection(self):
+        """Start and end each test without a shared connection."""
+        connection_module._sketchup_connection = None
+        connection_module._connection_key = None
+        yield
+        connection_module._sketchup_connection = None
+        connection_module._connection_key = None
+
+    def test_same_target_reuses_connection(self) -> None:
+        """Test that the same host, port and agent share one connection."""
+        first = get_sketchup_connection(host="localhost", port=9876, agent="mcp")
+        second = get_sketchup_connection(host="localhost", port=9876, agent="mcp")
+
+        assert second is first
+
+    @pytest.mark.parametrize(
+        "changed",
+        [{"host": "127.0.0.1"}, {"port": 9999}, {"agent": "user"}],
+    )
+    def test_changed_target_recreates_connection(self, changed: dict) -> None:
+        """Test that a different host, port or agent gets its own connection."""
+        target = {"host": "localhost", "port": 9876, "agent": "mcp"} | changed
+        first = get_sketchup_connection(host="localhost", port=9876, agent="mcp")
+
+        with patch.object(first, "disconnect") as mock_disconnect:
+            second = get_sketchup_connection(**target)
+
+        assert second is not first
+        assert (second.host, second.port, second.agent) == (
+            target["host"], target["port"], target["agent"]
+        )
+        mock_disconnect.assert_called_once()
@@ -1,5 +1,10 @@
 """Integration tests using mock runtime server."""
 
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import pytest
 
 from supex_driver.connection import SketchupConnection
@@ -11,16 +16,23 @@ from supex_driver.connection.exceptions import (
 from tests.helpers.mock_runtime import MockRuntimeServer
 
 
-@pytest.fixture
-def mock_server():
-    """Create and start a mock runtime server."""
+@pytest.fixture(scope="module")
+def shared_mock_server():
+    """Start one mock runtime server for all tests in this module."""
     server = MockRuntimeServer()
-    server.set_response("hello", result={"success": True})
     server.start()
     yield server
     server.stop()
 
 
+@pytest.fixture
+def mock_server(shared_mock_server: MockRuntimeServer) -> MockRuntimeServer:
+    """Provide the shared mock runtime server, reset for this test."""
+    shared_mock_server.reset()
+    shared_mock_server.set_response("hello", result={"success": True})
+    return shared_mock_server
+
+
 class TestIntegrationHello:
     """Test hello handshake with mock server."""
 
@@ -74,6 +86,34 @@ class TestIntegrationToolCall:
         assert tool_call["params"]["arguments"]["code"] == "1 + 1"
         conn.disconnect()
 
+    def test_handler_builds_result_from_request(
+        self, mock_server: MockRuntimeServer
+    ) -> None:
+        """Test that a registered handler sees the request it answers."""
+        mock_server.set_handler(
+            "tools/call", lambda request: {"echo": request["params"]["arguments"]}
+        )
+
+        conn = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        result = conn.send_command("eval_ruby", {"code": "1 + 1"})
+
+        assert result == {"echo": {"code": "1 + 1"}}
+        conn.disconnect()
+
+    def test_request_larger_than_read_buffer(self, mock_server: MockRuntimeServer) -> None:
+        """Test that requests bigger than the mock's receive buffer arrive intact."""
+        mock_server.set_handler(
+            "tools/call",
+            lambda request: {"length": len(request["params"]["arguments"]["code"])},
+        )
+        code = "x" * 200_000
+
+        conn = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        result = conn.send_command("eval_ruby", {"code": code})
+
+        assert result == {"length": len(code)}
+        conn.disconnect()
+
     def test_remote_error(self, mock_server: MockRuntimeServer) -> None:
         """Test remote error handling."""
         mock_server.set_response(
@@ -112,6 +152,42 @@ class TestIntegrationTimeout:
 
         conn.disconnect()
 
+    def test_delayed_reply_does_not_block_other_clients(
+        self, mock_server: MockRuntimeServer
+    ) -> None:
+        """Test that a client waiting on a delayed reply does not stall others."""
+        mock_server.set_response("tools/call", result={"success": True})
+        mock_server.set_delay(1.0, method="tools/call")
+
+        slow = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(slow.send_command, "slow_command")
+            time.sleep(0.1)
+
+            started = time.monotonic()
+            fast = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+            assert fast.connect()
+            assert time.monotonic() - started < 0.5
+
+            assert pending.result() == {"success": True}
+        fast.disconnect()
+        slow.disconnect()
+
+    def test_reset_drops_delayed_replies(self, mock_server: MockRuntimeServer) -> None:
+        """Test that reset() discards replies still waiting on their delay."""
+        mock_server.set_delay(5.0, method="tools/call")
+
+        conn = SketchupConnection(
+            host="127.0.0.1", port=mock_server.port, timeout=0.2
+        )
+        with pytest.raises((SketchUpTimeoutError, SketchUpConnectionError)):
+            conn.send_command("slow_command")
+        conn.disconnect()
+        assert mock_server._pending
+
+        mock_server.reset()
+        assert not mock_server._pending
+
 
 class TestIntegrationConnectionReuse:
     """Test connection reuse with mock server."""
@@ -137,3 +213,69 @@ class TestIntegrationConnectionReuse:
         assert hello_count == 1
 
         conn.disconnect()
+
+    def test_concurrent_commands_do_not_interleave(
+        self, mock_server: MockRuntimeServer
+    ) -> None:
+        """Test that commands from several threads each get their own response."""
+        mock_server.set_handler(
+            "tools/call", lambda request: {"name": request["params"]["name"]}
+        )
+        mock_server.set_delay(0.01, method="tools/call")
+
+        conn = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda i: conn.send_command(f"tool_{i}"), range(8)))
+
+        assert results == [{"name": f"tool_{i}"} for i in range(8)]
+        conn.disconnect()
+
+
+class TestIntegrationBatch:
+    """Test JSON-RPC batch requests with mock server."""
+
+    def test_send_commands_round_trip(self, mock_server: MockRuntimeServer) -> None:
+        """Test that a batch is answered with one response per command."""
+        mock_server.set_response("tools/call", result={"count": 1})
+
+        conn = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        responses = conn.send_commands(
+            [("get_model_info", None), ("ping", None), ("get_selection", None)]
+        )
+
+        assert [r["result"] for r in responses] == [{"count": 1}] * 3
+        # 1 hello + 3 batched tool calls
+        assert [r["method"] for r in mock_server.requests] == [
+            "hello", "tools/call", "tools/call", "tools/call"
+        ]
+        conn.disconnect()
+
+    def test_batch_is_sent_in_one_write(self, mock_server: MockRuntimeServer) -> None:
+        """Test that five batched commands go out in a single sendall."""
+        mock_server.set_handler(
+            "tools/call", lambda request: {"name": request["params"]["name"]}
+        )
+        conn = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        assert conn.connect()
+
+        writers: list[socket.socket] = []
+        original_sendall = socket.socket.sendall
+
+        def sendall(sock: socket.socket, data: bytes, *args: int) -> None:
+            writers.append(sock)
+            original_sendall(sock, data, *args)
+
+        with patch.object(socket.socket, "sendall", sendall):
+            responses = conn.send_commands([(f"tool_{i}", None) for i in range(5)])
+
+        assert writers.count(conn.sock) == 1
+        assert [r["result"] for r in responses] == [{"name": f"tool_{i}"} for i in range(5)]
+        conn.disconnect()
+
+    def test_batch_reports_errors_per_command(self, mock_server: MockRuntimeServer) -> None:
+        """Test that a failing command does not fail the whole batch."""
+        conn = SketchupConnection(host="127.0.0.1", port=mock_server.port)
+        responses = conn.send_commands([("unknown", None)])
+
+        assert responses[0]["error"]["code"] == -32601
+        conn.disconnect()
@@ -1,6 +1,26 @@
 """Tests for MCP server functionality."""
 
-from supex_driver.mcp.server import mcp
+import asyncio
+import inspect
+import io
+import json
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+
+from supex_driver.connection.exceptions import (
+    SketchUpConnectionError,
+    SketchUpProtocolError,
+    SketchUpRemoteError,
+)
+from supex_driver.mcp import server as server_module
+from supex_driver.mcp.server import LogFormatter, TeeStream, get_agent_name, mcp
 
 
 class TestMCPServer:
@@ -43,6 +63,527 @@ class TestMCPServer:
             assert hasattr(server, expected_tool), f"Missing tool: {expected_tool}"
 
 
+class TestFormatError:
+    """Test pre-encoded error responses."""
+
+    def test_connection_error(self) -> None:
+        """Test connection errors render as valid JSON."""
+        response = json.loads(
+            server_module._format_error(SketchUpConnectionError('lost "socket"'), "op")
+        )
+        assert response == {
+            "success": False,
+            "error": 'lost "socket"',
+            "error_type": "connection",
+        }
+
+    def test_protocol_error(self) -> None:
+        """Test protocol errors render as valid JSON."""
+        response = json.loads(
+            server_module._format_error(SketchUpProtocolError("bad\njson"), "op")
+        )
+        assert response["error"] == "bad\njson"
+        assert response["error_type"] == "protocol"
+
+    def test_remote_error_includes_code(self) -> None:
+        """Test remote errors carry the JSON-RPC error code."""
+        response = json.loads(
+            server_module._format_error(SketchUpRemoteError(-32000, "Ruby error"), "op")
+        )
+        assert response == {
+            "success": False,
+            "error": "Ruby error",
+            "error_type": "remote",
+            "error_code": -32000,
+        }
+
+    def test_unexpected_error_with_status_templates(self) -> None:
+        """Test status templates keep the check_sketchup_status shape."""
+        response = json.loads(
+            server_module._format_error(
+                RuntimeError("boom"), "op", server_module._STATUS_ERRORS
+            )
+        )
+        assert response == {
+            "status": "error",
+            "error": "boom",
+            "error_type": "unexpected",
+            "message": "Unexpected error occurred",
+        }
+
+
+def _tool_ctx() -> SimpleNamespace:
+    """Context stand-in for calling tool functions directly."""
+    return SimpleNamespace(request_id=7, request_context=None)
+
+
+def _run(tool: Callable[..., Awaitable[str]], *args: Any, **kwargs: Any) -> str:
+    """Run an async tool function to completion."""
+    return asyncio.run(tool(*args, **kwargs))
+
+
+class TestToolResponses:
+    """Test tool response shaping through call_tool."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_status_cache(self) -> None:
+        server_module._status_cache.clear()
+
+    def test_check_status_connected(self) -> None:
+        """Test status response built from the ping result."""
+        conn = Mock()
+        conn.send_command.return_value = {"version": "1.2.3"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(server_module.check_sketchup_status, _tool_ctx())
+            )
+
+        assert response == {
+            "status": "connected",
+            "version": "1.2.3",
+            "message": "SketchUp is connected and responding",
+        }
+        conn.send_command.assert_called_once_with(
+            method="ping", params={}, request_id=7
+        )
+
+    def test_call_tool_params_do_not_collide_with_options(self) -> None:
+        """Test that params named like call options are forwarded as params."""
+        conn = Mock()
+        conn.send_command.return_value = {"ok": True}
+        params = {"render": "fast", "error_templates": "none"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(server_module.call_tool, _tool_ctx(), "custom", "custom", params)
+            )
+
+        assert response == {"ok": True}
+        conn.send_command.assert_called_once_with(
+            method="custom", params=params, request_id=7
+        )
+
+    def test_check_status_reuses_encoded_response(self) -> None:
+        """Test that steady-state health checks reuse the encoded response."""
+        conn = Mock()
+        conn.send_command.return_value = {"version": "1.2.3"}
+        with (
+            patch.object(server_module, "get_sketchup_connection", return_value=conn),
+            patch.object(server_module, "STATUS_CACHE_TTL", 0),
+        ):
+            first = _run(server_module.check_sketchup_status, _tool_ctx())
+            second = _run(server_module.check_sketchup_status, _tool_ctx())
+
+        assert conn.send_command.call_count == 2
+        assert first is second
+
+    def test_check_status_polls_within_ttl_skip_rpc(self) -> None:
+        """Test rapid status polls reuse the last successful ping."""
+        conn = Mock()
+        conn.send_command.return_value = {"version": "1.2.3"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            _run(server_module.check_sketchup_status, _tool_ctx())
+            _run(server_module.check_sketchup_status, _tool_ctx())
+            assert conn.send_command.call_count == 1
+
+            with patch.object(server_module, "STATUS_CACHE_TTL", 0):
+                _run(server_module.check_sketchup_status, _tool_ctx())
+            assert conn.send_command.call_count == 2
+
+    def test_check_status_errors_are_not_cached(self) -> None:
+        """Test a failed ping is retried on the next poll."""
+        conn = Mock()
+        conn.send_command.side_effect = SketchUpConnectionError("refused")
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            _run(server_module.check_sketchup_status, _tool_ctx())
+            _run(server_module.check_sketchup_status, _tool_ctx())
+
+        assert conn.send_command.call_count == 2
+
+    def test_check_status_failure_clears_cached_entry(self) -> None:
+        """Test a failed ping drops the remembered status for that agent."""
+        conn = Mock()
+        conn.send_command.return_value = {"version": "1.2.3"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            _run(server_module.check_sketchup_status, _tool_ctx())
+            assert server_module._status_cache
+
+            conn.send_command.side_effect = SketchUpConnectionError("refused")
+            with patch.object(server_module, "STATUS_CACHE_TTL", 0):
+                response = json.loads(
+                    _run(server_module.check_sketchup_status, _tool_ctx())
+                )
+
+        assert response["status"] == "disconnected"
+        assert not server_module._status_cache
+
+    def test_check_status_cached_per_agent(self) -> None:
+        """Test one agent's cached status is not served to another."""
+        conn = Mock()
+        conn.send_command.return_value = {"version": "1.2.3"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            with patch.object(server_module, "get_agent_name", return_value="a"):
+                _run(server_module.check_sketchup_status, _tool_ctx())
+            with patch.object(server_module, "get_agent_name", return_value="b"):
+                _run(server_module.check_sketchup_status, _tool_ctx())
+
+        assert conn.send_command.call_count == 2
+
+    def test_check_status_disconnected(self) -> None:
+        """Test status response on connection failure."""
+        conn = Mock()
+        conn.send_command.side_effect = SketchUpConnectionError("refused")
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(server_module.check_sketchup_status, _tool_ctx())
+            )
+
+        assert response["status"] == "disconnected"
+        assert response["error"] == "refused"
+
+    def test_eval_ruby_uses_result_field(self) -> None:
+        """Test eval_ruby returns the runtime result text."""
+        conn = Mock()
+        conn.send_command.return_value = {"success": True, "result": "2"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(_run(server_module.eval_ruby, _tool_ctx(), "1 + 1"))
+
+        assert response == {"success": True, "result": "2"}
+
+    def test_eval_ruby_prefers_content_text(self) -> None:
+        """Test eval_ruby unwraps MCP-style content lists."""
+        conn = Mock()
+        conn.send_command.return_value = {"content": [{"type": "text", "text": "hi"}]}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(_run(server_module.eval_ruby, _tool_ctx(), "'hi'"))
+
+        assert response == {"success": True, "result": "hi"}
+
+    @pytest.mark.parametrize(
+        ("tool", "kwargs"),
+        [
+            ("export_scene", {"format": "dae"}),
+            ("list_entities", {"entity_type": "face"}),
+        ],
+    )
+    def test_invalid_enum_arguments_skip_rpc(
+        self, tool: str, kwargs: dict[str, str]
+    ) -> None:
+        """Test unsupported export formats and entity types fail before the RPC."""
+        conn = Mock()
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(getattr(server_module, tool), _tool_ctx(), **kwargs)
+            )
+
+        assert response["success"] is False
+        assert response["error_type"] == "validation"
+        conn.send_command.assert_not_called()
+
+    def test_export_format_is_case_insensitive(self) -> None:
+        """Test export formats are matched like the runtime does."""
+        conn = Mock()
+        conn.send_command.return_value = {"success": True, "file_path": "/tmp/x.png"}
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            _run(server_module.export_scene, _tool_ctx(), "PNG")
+
+        conn.send_command.assert_called_once()
+
+    def test_batch_screenshots_without_shots_skips_rpc(self) -> None:
+        """Test an empty batch is rejected without contacting SketchUp."""
+        conn = Mock()
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(server_module.take_batch_screenshots, _tool_ctx(), [])
+            )
+
+        assert response == {
+            "success": False,
+            "error": "No shots specified",
+            "error_type": "validation",
+        }
+        conn.send_command.assert_not_called()
+
+    def test_batch_screenshots_drops_redundant_overrides(self) -> None:
+        """Test per-shot sizes equal to the batch defaults are not sent."""
+        conn = Mock()
+        conn.send_command.return_value = {"success": True, "results": []}
+        shots = [
+            {"name": "a", "width": 1920, "height": 1080},
+            {"name": "b", "width": 800, "height": 1080},
+        ]
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            _run(server_module.take_batch_screenshots, _tool_ctx(), shots)
+
+        sent = conn.send_command.call_args.kwargs["params"]["shots"]
+        assert sent == [{"name": "a"}, {"name": "b", "width": 800}]
+        assert shots[0] == {"name": "a", "width": 1920, "height": 1080}
+
+
+class TestPassthroughTools:
+    """Test tools generated by _passthrough_tool."""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "console_capture_status",
+            "get_model_info",
+            "get_selection",
+            "get_layers",
+            "get_materials",
+            "get_camera_info",
+        ],
+    )
+    def test_description_is_dedented(self, name: str) -> None:
+        """Test descriptions match what a real docstring would give clients."""
+        doc = getattr(server_module, name).__doc__
+
+        assert doc == inspect.cleandoc(doc)
+        assert not any(line.startswith(" ") for line in doc.splitlines())
+
+
+class TestBatchCall:
+    """Test the batch_call tool."""
+
+    def test_results_follow_call_order(self) -> None:
+        """Test per-call status entries are built from the batch responses."""
+        conn = Mock()
+        conn.send_commands.return_value = [
+            {"jsonrpc": "2.0", "result": {"entities": 3}, "id": 1},
+            {"jsonrpc": "2.0", "error": {"code": -32603, "message": "boom"}, "id": 2},
+        ]
+        calls = [
+            {"method": "get_model_info"},
+            {"method": "list_entities", "params": {"entity_type": "faces"}},
+        ]
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(_run(server_module.batch_call, _tool_ctx(), calls))
+
+        conn.send_commands.assert_called_once_with(
+            [("get_model_info", None), ("list_entities", {"entity_type": "faces"})]
+        )
+        assert response == {
+            "success": True,
+            "results": [
+                {"method": "get_model_info", "status": "ok", "result": {"entities": 3}},
+                {
+                    "method": "list_entities",
+                    "status": "error",
+                    "error": "boom",
+                    "error_code": -32603,
+                },
+            ],
+        }
+
+    def test_invalid_call_skips_rpc(self) -> None:
+        """Test malformed calls are rejected without contacting SketchUp."""
+        conn = Mock()
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(server_module.batch_call, _tool_ctx(), [{"params": {}}])
+            )
+
+        assert response["success"] is False
+        assert "Call 0" in response["error"]
+        assert response["error_type"] == "validation"
+        conn.send_commands.assert_not_called()
+
+    def test_connection_error(self) -> None:
+        """Test connection failures use the standard tool error response."""
+        conn = Mock()
+        conn.send_commands.side_effect = SketchUpConnectionError("refused")
+        with patch.object(server_module, "get_sketchup_connection", return_value=conn):
+            response = json.loads(
+                _run(
+                    server_module.batch_call, _tool_ctx(), [{"method": "get_selection"}]
+                )
+            )
+
+        assert response["error_type"] == "connection"
+
+
+class _FakeSession:
+    """Minimal MCP session exposing client_params and counting lookups."""
+
+    def __init__(self, client_name: str | None) -> None:
+        self.lookups = 0
+        self._client_name = client_name
+
+    @property
+    def client_params(self) -> SimpleNamespace:
+        self.lookups += 1
+        return SimpleNamespace(clientInfo=SimpleNamespace(name=self._client_name))
+
+
+def _make_ctx(session: _FakeSession) -> SimpleNamespace:
+    return SimpleNamespace(request_context=SimpleNamespace(session=session))
+
+
+class TestGetAgentName:
+    """Test agent name resolution from MCP client info."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_client_name(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(server_module, "_mcp_client_name", None)
+        monkeypatch.delenv("SUPEX_AGENT", raising=False)
+
+    def test_uses_client_info_name(self) -> None:
+        """Test that clientInfo.name is used as the agent name."""
+        assert get_agent_name(_make_ctx(_FakeSession("claude-code"))) == "claude-code"
+
+    def test_client_name_resolved_once_per_process(self) -> None:
+        """Test that the clientInfo chain is not walked after the first hit."""
+        session = _FakeSession("claude-code")
+        ctx = _make_ctx(session)
+
+        for _ in range(3):
+            assert get_agent_name(ctx) == "claude-code"
+        assert session.lookups == 1
+
+        other = _FakeSession("other-client")
+        assert get_agent_name(_make_ctx(other)) == "claude-code"
+        assert other.lookups == 0
+
+    def test_falls_back_to_env_then_default(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test fallback when the session has no client name."""
+        ctx = _make_ctx(_FakeSession(None))
+        assert get_agent_name(ctx) == "mcp"
+
+        monkeypatch.setenv("SUPEX_AGENT", "tester")
+        assert get_agent_name(ctx) == "tester"
+
+
+class TestTeeStream:
+    """Test stderr mirroring into the log file."""
+
+    def test_writes_through_to_original_and_buffers_log(self) -> None:
+        """Test that the log copy is buffered until flush()."""
+        original = io.StringIO()
+        log_file = io.BytesIO()
+        tee = TeeStream(original, log_file)
+        try:
+            tee.write("hello\n")
+            assert original.getvalue() == "hello\n"
+
+            tee.flush()
+            assert log_file.getvalue() == b"hello\n"
+        finally:
+            tee.close_log()
+
+    def test_background_flush_after_output(self) -> None:
+        """Test that pending output is written without an explicit flush()."""
+        log_file = io.BytesIO()
+        tee = TeeStream(io.StringIO(), log_file)
+        try:
+            tee.write("later\n")
+            deadline = time.monotonic() + 5
+            while not log_file.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert log_file.getvalue() == b"later\n"
+        finally:
+            tee.close_log()
+
+    def test_close_log_stops_flusher(self) -> None:
+        """Test that close_log wakes and ends the idle flusher thread."""
+        tee = TeeStream(io.StringIO(), io.BytesIO())
+        tee.close_log()
+        tee._flusher.join(timeout=5)
+        assert not tee._flusher.is_alive()
+
+    def test_writelines_reaches_log(self) -> None:
+        """Test writelines goes through the tee instead of the original only."""
+        original = io.StringIO()
+        log_file = io.BytesIO()
+        tee = TeeStream(original, log_file)
+        try:
+            tee.writelines(["a\n", "b\n"])
+            tee.flush()
+            assert original.getvalue() == "a\nb\n"
+            assert log_file.getvalue() == b"a\nb\n"
+        finally:
+            tee.close_log()
+
+    def test_prebinds_stream_attributes(self) -> None:
+        """Test common stream attributes are copied, missing ones still forward."""
+        original = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        tee = TeeStream(original, io.BytesIO())
+        try:
+            assert tee.encoding == "utf-8"
+            assert tee.buffer is original.buffer
+            assert tee.isatty() is False
+            assert tee.line_buffering == original.line_buffering
+
+            plain = TeeStream(io.StringIO(), io.BytesIO())
+            assert not hasattr(plain, "buffer")
+            plain.close_log()
+        finally:
+            tee.close_log()
+
+    def test_large_writes_are_flushed_immediately(self) -> None:
+        """Test that the log buffer is written once it reaches the size limit."""
+        log_file = io.BytesIO()
+        tee = TeeStream(io.StringIO(), log_file)
+        try:
+            data = "x" * server_module.LOG_FLUSH_BYTES
+            tee.write(data)
+            assert log_file.getvalue() == data.encode()
+        finally:
+            tee.close_log()
+
+
+class TestSetupLogging:
+    """Test MCP server logging setup."""
+
+    @pytest.mark.parametrize(("tee", "installs"), [(None, 1), ("1", 1), ("0", 0)])
+    def test_supex_tee_controls_stderr_log(
+        self, monkeypatch: pytest.MonkeyPatch, tee: str | None, installs: int
+    ) -> None:
+        """Test SUPEX_TEE=0 skips mirroring stderr into the log file."""
+        if tee is None:
+            monkeypatch.delenv("SUPEX_TEE", raising=False)
+        else:
+            monkeypatch.setenv("SUPEX_TEE", tee)
+        monkeypatch.setattr(server_module, "_logging_configured", False)
+
+        with patch.object(server_module, "_install_stderr_tee") as install:
+            server_module.setup_logging()
+
+        assert install.call_count == installs
+
+
+class TestLogFormatter:
+    """Test the MCP server log line format."""
+
+    def _record(self, exc_info: Any = None) -> logging.LogRecord:
+        return logging.LogRecord(
+            "supex.mcp",
+            logging.INFO,
+            __file__,
+            1,
+            "Evaluating %d chars",
+            (42,),
+            exc_info,
+        )
+
+    def test_matches_standard_format_string(self) -> None:
+        """Test output matches the equivalent %-style format string."""
+        fmt = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        record = self._record()
+        reference = logging.Formatter(fmt).format(record)
+        assert LogFormatter().format(record) == reference
+
+    def test_appends_exception_text(self) -> None:
+        """Test exception tracebacks are appended like the stdlib formatter."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = self._record(sys.exc_info())
+        output = LogFormatter().format(record)
+        assert output.splitlines()[0].endswith("INFO - Evaluating 42 chars")
+        assert "ValueError: boom" in output
+
+
 def test_version_exists() -> None:
     """Test that version is properly defined."""
     import re
@@ -50,3 +591,11 @@ def test_version_exists() -> None:
     from supex_driver import __version__
 
     assert re.match(r"\d+\.\d+\.\d+", __version__)
+
+
+def test_dumps_produces_standard_json() -> None:
+    """Test that tool response encoding round-trips through stdlib json."""
+    from supex_driver.mcp.server import _dumps
+
+    payload = {"success": True, "result": "Žlutý kůň", "count": 3, "items": [1.5, None]}
+    assert json.loads(_dumps(payload)) == payload
@@ -1,9 +1,20 @@
 """Tests for CLI output modes."""
 
+import io
+import json
 import os
+import subprocess
 import sys
 from unittest.mock import patch
 
+from supex_driver.cli import output as output_module
+from supex_driver.cli.output import (
+    Output,
+    _should_use_plain_output,
+    _strip_markup,
+    get_output,
+)
+
 
 class TestShouldUsePlainOutput:
     """Test environment variable and TTY detection for output mode."""
@@ -11,36 +22,26 @@ class TestShouldUsePlainOutput:
     def test_supex_plain_forces_plain_mode(self) -> None:
         """SUPEX_PLAIN=1 should force plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is True
 
     def test_supex_color_forces_rich_mode(self) -> None:
         """SUPEX_COLOR=1 should force rich mode."""
         with patch.dict(os.environ, {"SUPEX_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is False
 
     def test_supex_plain_overrides_supex_color(self) -> None:
         """SUPEX_PLAIN should take priority over SUPEX_COLOR."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1", "SUPEX_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is True
 
     def test_no_color_enables_plain(self) -> None:
         """NO_COLOR should enable plain mode."""
         with patch.dict(os.environ, {"NO_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is True
 
     def test_no_color_empty_value_ignored(self) -> None:
         """NO_COLOR with empty value should be ignored (fall through to TTY)."""
         with patch.dict(os.environ, {"NO_COLOR": ""}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             # Should fall through to TTY detection
             # In test environment, stdout is likely not a TTY
             result = _should_use_plain_output()
@@ -49,29 +50,21 @@ class TestShouldUsePlainOutput:
     def test_force_color_enables_rich(self) -> None:
         """FORCE_COLOR should enable rich mode."""
         with patch.dict(os.environ, {"FORCE_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is False
 
     def test_no_color_overrides_force_color(self) -> None:
         """NO_COLOR should take priority over FORCE_COLOR."""
         with patch.dict(os.environ, {"NO_COLOR": "1", "FORCE_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is True
 
     def test_supex_color_overrides_no_color(self) -> None:
         """SUPEX_COLOR should take priority over NO_COLOR."""
         with patch.dict(os.environ, {"SUPEX_COLOR": "1", "NO_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             assert _should_use_plain_output() is False
 
     def test_tty_detection_fallback(self) -> None:
         """Without env vars, should fall back to TTY detection."""
         with patch.dict(os.environ, {}, clear=True):
-            from supex_driver.cli.output import _should_use_plain_output
-
             # Mock isatty to test both cases
             with patch.object(sys.stdout, "isatty", return_value=True):
                 assert _should_use_plain_output() is False
@@ -85,8 +78,6 @@ class TestStripMarkup:
 
     def test_strip_color_tags(self) -> None:
         """Should strip color tags."""
-        from supex_driver.cli.output import _strip_markup
-
         assert _strip_markup("[green]text[/green]") == "text"
         assert _strip_markup("[red]error[/red]") == "error"
         assert _strip_markup("[yellow]warning[/yellow]") == "warning"
@@ -94,37 +85,32 @@ class TestStripMarkup:
 
     def test_strip_style_tags(self) -> None:
         """Should strip style tags."""
-        from supex_driver.cli.output import _strip_markup
-
         assert _strip_markup("[dim]faint[/dim]") == "faint"
         assert _strip_markup("[bold]strong[/bold]") == "strong"
 
     def test_strip_nested_tags(self) -> None:
         """Should strip nested tags."""
-        from supex_driver.cli.output import _strip_markup
-
         assert _strip_markup("[green][bold]text[/bold][/green]") == "text"
 
     def test_preserve_unicode(self) -> None:
         """Should preserve unicode characters like checkmarks."""
-        from supex_driver.cli.output import _strip_markup
-
         assert _strip_markup("[green]\u2713[/green] Done") == "\u2713 Done"
         assert _strip_markup("[red]\u2717[/red] Failed") == "\u2717 Failed"
 
     def test_preserve_text_without_markup(self) -> None:
         """Should preserve text without markup."""
-        from supex_driver.cli.output import _strip_markup
-
         assert _strip_markup("plain text") == "plain text"
         assert _strip_markup("text with [brackets]") == "text with "
 
     def test_strip_opening_tag_only(self) -> None:
         """Should strip opening tags."""
-        from supex_driver.cli.output import _strip_markup
-
         assert _strip_markup("[green]text") == "text"
 
+    def test_preserve_non_tag_brackets(self) -> None:
+        """Should keep brackets that do not hold a tag name, such as lists."""
+        assert _strip_markup("points: [1, 2, 3]") == "points: [1, 2, 3]"
+        assert _strip_markup("[green]ok[/green] [0.5, 1]") == "ok [0.5, 1]"
+
 
 class TestOutputClass:
     """Test Output class methods."""
@@ -132,32 +118,32 @@ class TestOutputClass:
     def test_is_plain_property(self) -> None:
         """is_plain property should reflect the mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             assert out.is_plain is True
 
         with patch.dict(os.environ, {"SUPEX_COLOR": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             assert out.is_plain is False
 
     def test_print_plain_mode(self) -> None:
         """print() should strip markup in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             with patch("builtins.print") as mock_print:
                 out.print("[green]hello[/green]")
                 mock_print.assert_called_once_with("hello")
 
+    def test_print_plain_mode_multiple_args(self) -> None:
+        """print() should join args with spaces and strip markup from each."""
+        with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
+            out = Output()
+            with patch("builtins.print") as mock_print:
+                out.print("[bold]Count:[/bold]", 3, [1, 2])
+                mock_print.assert_called_once_with("Count: 3 [1, 2]")
+
     def test_success_plain_mode(self) -> None:
         """success() should use [OK] prefix in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             with patch("builtins.print") as mock_print:
                 out.success("Done")
@@ -166,8 +152,6 @@ class TestOutputClass:
     def test_error_plain_mode(self) -> None:
         """error() should use [ERROR] prefix in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             with patch("builtins.print") as mock_print:
                 out.error("Something failed")
@@ -176,8 +160,6 @@ class TestOutputClass:
     def test_warning_plain_mode(self) -> None:
         """warning() should use [WARN] prefix in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             with patch("builtins.print") as mock_print:
                 out.warning("Be careful")
@@ -186,8 +168,6 @@ class TestOutputClass:
     def test_info_plain_mode(self) -> None:
         """info() should print plain text in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             with patch("builtins.print") as mock_print:
                 out.info("Information")
@@ -196,35 +176,37 @@ class TestOutputClass:
     def test_panel_plain_mode(self) -> None:
         """panel() should print bordered text in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             captured: list[str] = []
-            with patch("builtins.print", side_effect=lambda *args, **kwargs: captured.append(args[0] if args else "")):
+            with patch("builtins.print", side_effect=lambda *args, **kwargs: captured.extend(args[0].splitlines() if args else [""])):
                 out.panel("Content here", title="Title")
 
-            assert "--- Title ---" in captured
-            assert "Content here" in captured
+            assert captured == ["--- Title ---", "Content here", "-------------"]
 
     def test_table_plain_mode(self) -> None:
         """table() should print aligned key-value pairs in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             captured: list[str] = []
-            with patch("builtins.print", side_effect=lambda *args, **kwargs: captured.append(args[0] if args else "")):
+            with patch("builtins.print", side_effect=lambda *args, **kwargs: captured.extend(args[0].splitlines() if args else [""])):
                 out.table({"name": "Test", "count": 42}, title="Info")
 
             assert "Info:" in captured
             assert any("name" in line and "Test" in line for line in captured)
             assert any("count" in line and "42" in line for line in captured)
 
+    def test_table_plain_mode_single_write(self) -> None:
+        """table() should emit all rows with one print call in plain mode."""
+        with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
+            out = Output()
+            with patch("builtins.print") as mock_print:
+                out.table({"name": "Test", "count": 42}, title="Info")
+
+            mock_print.assert_called_once_with("Info:\n  name   Test\n  count  42")
+
     def test_json_plain_mode(self) -> None:
         """json() should print indented JSON in plain mode."""
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output
-
             out = Output()
             with patch("builtins.print") as mock_print:
                 out.json({"key": "value"})
@@ -232,6 +214,71 @@ class TestOutputClass:
                 assert '"key"' in call_args
                 assert '"value"' in call_args
 
+    def test_json_plain_mode_matches_stdlib_indent(self) -> None:
+        """json() output should match two-space stdlib indentation, unicode kept."""
+        data = {"name": "Größe", "items": [1, 2], "nested": {"ok": True, "none": None}}
+        with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
+            out = Output()
+            with patch("builtins.print") as mock_print:
+                out.json(data)
+
+        mock_print.assert_called_once_with(
+            json.dumps(data, indent=2, ensure_ascii=False)
+        )
+
+    def test_json_plain_mode_non_string_keys(self) -> None:
+        """json() should accept int keys and big ints the way the stdlib does."""
+        with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
+            out = Output()
+            with patch("builtins.print") as mock_print:
+                out.json({1: "a"})
+                out.json({"big": 1 << 70})
+
+        assert [c.args[0] for c in mock_print.call_args_list] == [
+            json.dumps({1: "a"}, indent=2, ensure_ascii=False),
+            json.dumps({"big": 1 << 70}, indent=2, ensure_ascii=False),
+        ]
+
+    def test_rich_mode_renders_panel_table_json(self) -> None:
+        """Rich mode should render panels, tables and JSON through the console."""
+        from rich.console import Console
+
+        with patch.dict(os.environ, {"SUPEX_COLOR": "1"}, clear=True):
+            out = Output()
+        buffer = io.StringIO()
+        out._console = Console(file=buffer, width=80, color_system=None)
+
+        out.panel("Content here", title="Title")
+        out.table({"name": "Test"}, title="Info")
+        out.json({"key": "value"})
+
+        rendered = buffer.getvalue()
+        assert "Content here" in rendered
+        assert "Test" in rendered
+        assert '"key": "value"' in rendered
+
+    def test_plain_mode_does_not_import_rich(self) -> None:
+        """Plain mode should work without loading Rich at all."""
+        code = (
+            "import sys\n"
+            "from supex_driver.cli.output import Output\n"
+            "out = Output()\n"
+            "out.table({'a': 1}, title='T')\n"
+            "out.panel('p', title='P')\n"
+            "out.json({'k': 'v'})\n"
+            "assert not any(m == 'rich' or m.startswith('rich.') for m in sys.modules)\n"
+        )
+        env = {**os.environ, "SUPEX_PLAIN": "1"}
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            check=False,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
 
 class TestGetOutput:
     """Test get_output() singleton behavior."""
@@ -239,26 +286,18 @@ class TestGetOutput:
     def test_get_output_returns_output_instance(self) -> None:
         """get_output() should return an Output instance."""
         # Reset global state
-        import supex_driver.cli.output as output_module
-
         output_module._output = None
 
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import Output, get_output
-
             result = get_output()
             assert isinstance(result, Output)
 
     def test_get_output_returns_same_instance(self) -> None:
         """get_output() should return the same instance on subsequent calls."""
         # Reset global state
-        import supex_driver.cli.output as output_module
-
         output_module._output = None
 
         with patch.dict(os.environ, {"SUPEX_PLAIN": "1"}, clear=True):
-            from supex_driver.cli.output import get_output
-
             first = get_output()
             second = get_output()
             assert first is second
@@ -268,11 +268,15 @@ module SupexRuntime
         request = JSON.parse(json_data)
         log_verbose "Parsed request: #{request.inspect}"
 
-        response = handle_jsonrpc_request(request, context)
+        response = if request.is_a?(Array)
+                     handle_jsonrpc_batch(request, context)
+                   else
+                     handle_jsonrpc_request(request, context)
+                   end
         send_response(client, response)
 
         # Continue loop only for hello requests, close after other requests
-        request['method'] == 'hello'
+        request.is_a?(Hash) && request['method'] == 'hello'
       rescue JSON::ParserError => e
         log "JSON parse error: #{e.message}"
         log "Raw data was: #{data.inspect}"
@@ -281,7 +285,7 @@ module SupexRuntime
       rescue StandardError => e
         log "Request error: #{e.message}"
         log e.backtrace.join("\n")
-        send_error_response(client, e.message, -32_603, request&.dig('id'))
+        send_error_response(client, e.message, -32_603, request.is_a?(Hash) ? request['id'] : nil)
         false
       end
     end
@@ -392,6 +396,29 @@ module SupexRuntime
       response
     end
 
+    # Handle JSON-RPC batch request (array of requests)
+    # Elements are dispatched in order and answered in a single response array,
+    # so a client pays one round trip for several calls. A failing element
+    # yields an error entry without aborting the rest of the batch.
+    # @param requests [Array] parsed JSON-RPC requests
+    # @param context [ConnectionContext] connection-scoped state
+    # @return [Array<Hash>, Hash] JSON-RPC responses, or an error for an empty batch
+    def handle_jsonrpc_batch(requests, context)
+      return Utils.create_error_response({}, 'Invalid Request: empty batch', -32_600) if requests.empty?
+
+      log "Received batch of #{requests.size} requests"
+      requests.map do |request|
+        next Utils.create_error_response({}, 'Invalid Request', -32_600) unless request.is_a?(Hash)
+
+        begin
+          handle_jsonrpc_request(request, context)
+        rescue StandardError => e
+          log "[req:#{request['id']}] Error: #{e.message}"
+          Utils.create_error_response(request, e.message)
+        end
+      end
+    end
+
     # Handle hello handshake request
     # @param request [Hash] JSON-RPC request with client identification
     # @param context [ConnectionContext] connection-scoped state
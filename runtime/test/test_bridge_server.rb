@@ -311,6 +311,46 @@ class TestBridgeServer < Minitest::Test
     assert response[:result][:version]
   end
 
+  # ==========================================================================
+  # handle_jsonrpc_batch tests (unit)
+  # ==========================================================================
+
+  def test_handle_jsonrpc_batch_answers_each_request_in_order
+    server = SupexRuntime::BridgeServer.new(port: 0)
+    context = SupexRuntime::BridgeServer::ConnectionContext.new(client_info: { name: 'test' })
+    requests = [
+      { 'jsonrpc' => '2.0', 'method' => 'ping', 'id' => 1 },
+      { 'jsonrpc' => '2.0', 'method' => 'tools/call',
+        'params' => { 'name' => 'eval_ruby', 'arguments' => { 'code' => '1 + 1' } }, 'id' => 2 },
+      { 'jsonrpc' => '2.0', 'method' => 'tools/call',
+        'params' => { 'name' => 'nonexistent_tool', 'arguments' => {} }, 'id' => 3 }
+    ]
+
+    responses = server.send(:handle_jsonrpc_batch, requests, context)
+
+    assert_equal [1, 2, 3], responses.map { |r| r[:id] }
+    assert_equal 'ok', responses[0][:result][:status]
+    assert_equal '2', responses[1][:result][:result]
+    assert_includes responses[2][:error][:message], 'Unknown tool'
+  end
+
+  def test_handle_jsonrpc_batch_requires_identification
+    server = SupexRuntime::BridgeServer.new(port: 0)
+    context = SupexRuntime::BridgeServer::ConnectionContext.new(client_info: nil)
+
+    responses = server.send(:handle_jsonrpc_batch, [{ 'method' => 'ping', 'id' => 1 }], context)
+
+    assert_includes responses[0][:error][:message], 'hello'
+  end
+
+  def test_handle_jsonrpc_batch_rejects_empty_and_invalid_elements
+    server = SupexRuntime::BridgeServer.new(port: 0)
+    context = SupexRuntime::BridgeServer::ConnectionContext.new(client_info: { name: 'test' })
+
+    assert_equal(-32_600, server.send(:handle_jsonrpc_batch, [], context)[:error][:code])
+    assert_equal(-32_600, server.send(:handle_jsonrpc_batch, [42], context)[0][:error][:code])
+  end
+
   # ==========================================================================
   # require_identification_error tests
   # ==========================================================================
@@ -559,6 +599,31 @@ class TestBridgeServer < Minitest::Test
     assert_includes response['error']['message'], 'hello'
   end
 
+  def test_batch_with_hello_integration
+    @server = SupexRuntime::BridgeServer.new(port: 0)
+    @server.start
+    port = @server.instance_variable_get(:@server).addr[1]
+
+    client_thread = Thread.new do
+      client = MockBridgeClient.new(port: port)
+      client.send_request([
+                            { 'jsonrpc' => '2.0', 'method' => 'hello',
+                              'params' => { 'name' => 'test-client', 'version' => '1.0',
+                                            'agent' => 'test', 'pid' => Process.pid },
+                              'id' => 'hello' },
+                            { 'jsonrpc' => '2.0', 'method' => 'ping', 'id' => 1 }
+                          ])
+    end
+
+    sleep 0.05
+    UI.timers.values.first[:block].call
+
+    responses = client_thread.value
+    assert_kind_of Array, responses, "Batch should return an array: #{responses.inspect}"
+    assert responses[0]['result']['success']
+    assert_equal 'ok', responses[1]['result']['status']
+  end
+
   # ==========================================================================
   # Framing tests (newline-delimited JSON)
   # ==========================================================================